@@ -9,19 +9,28 @@ This system creates a unified ecosystem where:
 """
 
 import asyncio
-import json
 import logging
-import subprocess
+import mmap
+import os
+import re
 import sys
 import time
 from datetime import datetime
+from enum import IntEnum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
+from urllib.parse import quote
 import uuid
+from collections import OrderedDict
+from contextlib import AsyncExitStack, suppress
 from dataclasses import dataclass, asdict
 import httpx
+import msgspec
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, HttpUrl
 import uvicorn
 
@@ -29,24 +38,106 @@ import uvicorn
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Timeouts for the shared HTTP client
+DISCOVERY_TIMEOUT = httpx.Timeout(10.0)
+PROXY_TIMEOUT = httpx.Timeout(30.0)
+
+# Matches "{name}" path-parameter placeholders in OpenAPI path templates
+PATH_PARAM_RE = re.compile(r'\{([^}]+)\}')
+
+# Upstream headers forwarded on streamed proxy responses; the body is sent
+# undecoded, so its content-encoding must travel with it
+PROXY_PASSTHROUGH_HEADERS = ("content-type", "content-encoding")
+
+# Seconds to wait after a change before persisting, coalescing bursts of writes
+SAVE_INTERVAL = 1.0
+
+# Maximum number of MCP sessions kept open; least recently used are closed first
+MAX_MCP_SESSIONS = int(os.environ.get("MAX_MCP_SESSIONS", "16"))
+
+def _load_json_file(path: Path) -> Any:
+    """Parse a JSON file through a read-only memory map, avoiding a buffer copy"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return {}
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    finally:
+        os.close(fd)
+
+def _is_json_media_type(content_type: str) -> bool:
+    """Whether a Content-Type header names JSON (application/json or a +json suffix)"""
+    media_type = content_type.partition(';')[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+class _StatusEnum(IntEnum):
+    """Status enum persisted and reported as its lowercase name"""
+
+    @classmethod
+    def parse(cls, value: Union[str, "_StatusEnum"]) -> "_StatusEnum":
+        if isinstance(value, cls):
+            return value
+        return cls.__members__.get(str(value).upper(), cls._fallback())
+
+    @classmethod
+    def _fallback(cls) -> "_StatusEnum":
+        return next(iter(cls))
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+class MCPStatus(_StatusEnum):
+    """Lifecycle state of an MCP server"""
+    STOPPED = 0
+    STARTING = 1
+    RUNNING = 2
+    ERROR = 3
+
+class OpenAPIStatus(_StatusEnum):
+    """Reachability of an OpenAPI server"""
+    UNKNOWN = 0
+    ONLINE = 1
+    OFFLINE = 2
+    ERROR = 3
+
+class _DictCacheMixin:
+    """Memoizes asdict() output, invalidated whenever an attribute is assigned"""
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_dict_cache', None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the cached dict form; callers must not mutate it"""
+        cached = getattr(self, '_dict_cache', None)
+        if cached is None:
+            cached = asdict(self)
+            # Report enum statuses by name rather than by integer value
+            cached['status'] = str(cached['status'])
+            object.__setattr__(self, '_dict_cache', cached)
+        return cached
+
 @dataclass
-class MCPServerInfo:
+class MCPServerInfo(_DictCacheMixin):
     """Information about an MCP server"""
     id: str
     name: str
     command: List[str]
     description: str = ""
     tools: List[Dict] = None
-    status: str = "stopped"  # stopped, starting, running, error
+    status: MCPStatus = MCPStatus.STOPPED
     process_id: Optional[int] = None
     last_health_check: Optional[datetime] = None
     
     def __post_init__(self):
         if self.tools is None:
             self.tools = []
+        self.status = MCPStatus.parse(self.status)
 
 @dataclass
-class OpenAPIServerInfo:
+class OpenAPIServerInfo(_DictCacheMixin):
     """Information about an OpenAPI server"""
     id: str
     name: str
@@ -54,12 +145,65 @@ class OpenAPIServerInfo:
     openapi_url: str
     description: str = ""
     endpoints: List[Dict] = None
-    status: str = "unknown"  # unknown, online, offline, error
+    status: OpenAPIStatus = OpenAPIStatus.UNKNOWN
     last_seen: Optional[datetime] = None
     
     def __post_init__(self):
         if self.endpoints is None:
             self.endpoints = []
+        self.status = OpenAPIStatus.parse(self.status)
+        # Not dataclass fields, so they stay out of asdict() output
+        self.url_base = self.base_url.rstrip('/')
+        self.endpoints_by_op: Dict[str, Dict] = {}
+        self.set_endpoints(self.endpoints)
+
+    def set_endpoints(self, endpoints: List[Dict]):
+        """Replace the endpoint list and rebuild the operation_id index"""
+        self.endpoints = endpoints
+        self.endpoints_by_op = {ep['operation_id']: ep for ep in endpoints}
+
+class _Operation(msgspec.Struct):
+    """The parts of an OpenAPI operation object the bridge keeps"""
+    operationId: Optional[str] = None
+    summary: Optional[str] = ""
+    description: Optional[str] = ""
+    parameters: List[Any] = []
+
+class _OpenAPISpec(msgspec.Struct):
+    """Top-level OpenAPI document, reduced to its paths"""
+    # Path items stay raw so one malformed entry (or an x- extension) can't fail the whole spec
+    paths: Dict[str, msgspec.Raw] = {}
+
+_HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+_SPEC_DECODER = msgspec.json.Decoder(_OpenAPISpec)
+_PATH_ITEM_DECODER = msgspec.json.Decoder(Dict[str, msgspec.Raw])
+_OPERATION_DECODER = msgspec.json.Decoder(_Operation)
+
+def _parse_endpoints(content: bytes) -> List[Dict]:
+    """Extract the operations of an OpenAPI spec, skipping entries that aren't valid operation objects"""
+    endpoints = []
+    for path, raw_item in _SPEC_DECODER.decode(content).paths.items():
+        try:
+            item = _PATH_ITEM_DECODER.decode(raw_item)
+        except msgspec.ValidationError:
+            continue
+        for method in _HTTP_METHODS:
+            if method not in item:
+                continue
+            try:
+                operation = _OPERATION_DECODER.decode(item[method])
+            except msgspec.ValidationError:
+                continue
+            if operation.operationId:
+                endpoints.append({
+                    'operation_id': operation.operationId,
+                    'path': path,
+                    'method': method.upper(),
+                    'summary': operation.summary,
+                    'description': operation.description,
+                    'parameters': operation.parameters
+                })
+    return endpoints
 
 class MCPToolRequest(BaseModel):
     """Request to call an MCP tool"""
@@ -79,13 +223,33 @@ class OpenAPICallRequest(BaseModel):
 class BidirectionalBridge:
     """Main bridge system for OpenAPI ↔ MCP connectivity"""
     
-    def __init__(self, data_dir: str = "./data"):
+    def __init__(self, data_dir: str = "./data", http_client: Optional[httpx.AsyncClient] = None):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
+        # Shared HTTP client, assigned at application startup
+        self.http_client = http_client
+        
         self.mcp_servers: Dict[str, MCPServerInfo] = {}
         self.openapi_servers: Dict[str, OpenAPIServerInfo] = {}
-        self.client_sessions: Dict[str, Any] = {}  # MCP client sessions
+        
+        # Running totals for get_stats, maintained by the mutators below
+        self._running_mcp = 0
+        self._tool_count = 0
+        self._online_openapi = 0
+        self._endpoint_count = 0
+        self.client_sessions: "OrderedDict[str, Any]" = OrderedDict()  # MCP client sessions, LRU order
+        self._session_handles: Dict[str, Tuple[asyncio.Task, asyncio.Event]] = {}
+        self._start_locks: Dict[str, asyncio.Lock] = {}
+        self._session_users: Dict[str, int] = {}  # In-flight tool calls per session
+        
+        # Environment for MCP server processes, copied once rather than per start
+        self._base_env: Dict[str, str] = os.environ.copy()
+        
+        # Debounced persistence, flushed by _save_loop
+        self._save_event = asyncio.Event()
+        self._save_task: Optional[asyncio.Task] = None
+        self._write_future: Optional[asyncio.Future] = None
         
         # Load existing data
         self.load_data()
@@ -95,25 +259,23 @@ class BidirectionalBridge:
         try:
             mcp_file = self.data_dir / "mcp_servers.json"
             if mcp_file.exists():
-                with open(mcp_file) as f:
-                    data = json.load(f)
-                    for server_id, server_data in data.items():
-                        if server_data.get("last_health_check"):
-                            server_data["last_health_check"] = datetime.fromisoformat(
-                                server_data["last_health_check"]
-                            )
-                        self.mcp_servers[server_id] = MCPServerInfo(**server_data)
+                data = _load_json_file(mcp_file)
+                for server_id, server_data in data.items():
+                    if server_data.get("last_health_check"):
+                        server_data["last_health_check"] = datetime.fromisoformat(
+                            server_data["last_health_check"]
+                        )
+                    self.add_mcp_server(MCPServerInfo(**server_data))
                         
             openapi_file = self.data_dir / "openapi_servers.json"
             if openapi_file.exists():
-                with open(openapi_file) as f:
-                    data = json.load(f)
-                    for server_id, server_data in data.items():
-                        if server_data.get("last_seen"):
-                            server_data["last_seen"] = datetime.fromisoformat(
-                                server_data["last_seen"]
-                            )
-                        self.openapi_servers[server_id] = OpenAPIServerInfo(**server_data)
+                data = _load_json_file(openapi_file)
+                for server_id, server_data in data.items():
+                    if server_data.get("last_seen"):
+                        server_data["last_seen"] = datetime.fromisoformat(
+                            server_data["last_seen"]
+                        )
+                    self.add_openapi_server(OpenAPIServerInfo(**server_data))
                         
             logger.info(f"Loaded {len(self.mcp_servers)} MCP servers and {len(self.openapi_servers)} OpenAPI servers")
         except Exception as e:
@@ -121,53 +283,100 @@ class BidirectionalBridge:
     
     def save_data(self):
         """Persist bridge data"""
+        self._write_snapshot(self._snapshot())
+
+    def _snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Capture serializable copies of the server maps"""
+        return {
+            "mcp_servers.json": {k: v.to_dict() for k, v in self.mcp_servers.items()},
+            "openapi_servers.json": {k: v.to_dict() for k, v in self.openapi_servers.items()},
+        }
+
+    def _write_snapshot(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Encode and write a snapshot to the data directory"""
         try:
-            def json_encoder(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                return obj
-            
-            mcp_file = self.data_dir / "mcp_servers.json"
-            with open(mcp_file, 'w') as f:
-                json.dump({k: asdict(v) for k, v in self.mcp_servers.items()}, 
-                         f, default=json_encoder, indent=2)
-                
-            openapi_file = self.data_dir / "openapi_servers.json"
-            with open(openapi_file, 'w') as f:
-                json.dump({k: asdict(v) for k, v in self.openapi_servers.items()}, 
-                         f, default=json_encoder, indent=2)
-                         
+            # orjson serializes datetimes natively as ISO 8601
+            for filename, data in snapshot.items():
+                # Write beside the target and rename over it, so readers never see a partial file
+                path = self.data_dir / filename
+                tmp_path = path.with_name(path.name + ".tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_path, path)
         except Exception as e:
             logger.error(f"Error saving data: {e}")
+
+    def request_save(self):
+        """Mark state dirty; the background save loop persists it"""
+        self._save_event.set()
+
+    async def _save_loop(self):
+        """Coalesce save requests into at most one write per SAVE_INTERVAL"""
+        while True:
+            await self._save_event.wait()
+            await asyncio.sleep(SAVE_INTERVAL)
+            self._save_event.clear()
+            # Snapshot on the event loop so the thread never sees a mutating dict
+            snapshot = self._snapshot()
+            # Shielded and tracked: cancelling the loop can't stop the worker thread mid-write,
+            # so stop_save_loop waits on the write itself
+            self._write_future = asyncio.ensure_future(asyncio.to_thread(self._write_snapshot, snapshot))
+            await asyncio.shield(self._write_future)
+
+    def start_save_loop(self):
+        """Start the background persistence task"""
+        self._save_task = asyncio.create_task(self._save_loop())
+
+    async def stop_save_loop(self):
+        """Stop the background persistence task, flushing any pending changes"""
+        if self._save_task:
+            self._save_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._save_task
+            self._save_task = None
+        if self._write_future:
+            # Wait out a write already running in its worker thread so the flush below lands last
+            await self._write_future
+            self._write_future = None
+        if self._save_event.is_set():
+            self._save_event.clear()
+            self.save_data()
     
     async def discover_openapi_servers(self) -> List[OpenAPIServerInfo]:
         """Discover OpenAPI servers from the registry"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get("http://localhost:9000/servers")
-                if response.status_code == 200:
-                    data = response.json()
-                    servers = []
-                    
-                    for server_data in data.get('servers', []):
-                        server_id = f"openapi_{uuid.uuid4().hex[:8]}"
-                        server = OpenAPIServerInfo(
-                            id=server_id,
-                            name=server_data['name'],
-                            base_url=server_data['base_url'],
-                            openapi_url=server_data['openapi_url'],
-                            description=server_data.get('description', ''),
-                            status=server_data.get('status', 'unknown'),
-                            last_seen=datetime.now()
-                        )
-                        
-                        # Load OpenAPI spec and extract endpoints
-                        await self.load_openapi_endpoints(server)
-                        servers.append(server)
-                        self.openapi_servers[server_id] = server
-                    
-                    self.save_data()
-                    return servers
+            response = await self.http_client.get(
+                "http://localhost:9000/servers", timeout=DISCOVERY_TIMEOUT
+            )
+            if response.status_code == 200:
+                data = await asyncio.to_thread(orjson.loads, response.content)
+                servers = []
+                
+                for server_data in data.get('servers', []):
+                    server_id = f"openapi_{uuid.uuid4().hex[:8]}"
+                    server = OpenAPIServerInfo(
+                        id=server_id,
+                        name=server_data['name'],
+                        base_url=server_data['base_url'],
+                        openapi_url=server_data['openapi_url'],
+                        description=server_data.get('description', ''),
+                        status=server_data.get('status', 'unknown'),
+                        last_seen=datetime.now()
+                    )
+                    servers.append(server)
+
+                # Load OpenAPI specs and extract endpoints concurrently
+                results = await asyncio.gather(
+                    *(self.load_openapi_endpoints(s) for s in servers),
+                    return_exceptions=True
+                )
+                for server, result in zip(servers, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error loading OpenAPI endpoints for {server.name}: {result}")
+                    self.add_openapi_server(server)
+
+                self.request_save()
+                return servers
         except Exception as e:
             logger.error(f"Error discovering OpenAPI servers: {e}")
         return []
@@ -175,25 +384,11 @@ class BidirectionalBridge:
     async def load_openapi_endpoints(self, server: OpenAPIServerInfo):
         """Load endpoints from OpenAPI specification"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(server.openapi_url)
-                if response.status_code == 200:
-                    spec = response.json()
-                    endpoints = []
-                    
-                    for path, methods in spec.get('paths', {}).items():
-                        for method, operation in methods.items():
-                            if isinstance(operation, dict) and operation.get('operationId'):
-                                endpoints.append({
-                                    'operation_id': operation['operationId'],
-                                    'path': path,
-                                    'method': method.upper(),
-                                    'summary': operation.get('summary', ''),
-                                    'description': operation.get('description', ''),
-                                    'parameters': operation.get('parameters', [])
-                                })
-                    
-                    server.endpoints = endpoints
+            response = await self.http_client.get(server.openapi_url, timeout=DISCOVERY_TIMEOUT)
+            if response.status_code == 200:
+                # Typed decode only materializes the fields we keep
+                endpoints = await asyncio.to_thread(_parse_endpoints, response.content)
+                server.set_endpoints(endpoints)
         except Exception as e:
             logger.error(f"Error loading OpenAPI endpoints for {server.name}: {e}")
     
@@ -201,10 +396,10 @@ class BidirectionalBridge:
         """Discover MCP servers from Claude configuration"""
         try:
             config_file = Path.home() / "Library/Application Support/Claude/claude_desktop_config.json"
-            if config_file.exists():
-                with open(config_file) as f:
-                    config = json.load(f)
-                    
+            if await asyncio.to_thread(config_file.exists):
+                raw = await asyncio.to_thread(config_file.read_bytes)
+                config = orjson.loads(raw)
+                
                 servers = []
                 for server_name, server_config in config.get('mcpServers', {}).items():
                     server_id = f"mcp_{uuid.uuid4().hex[:8]}"
@@ -215,70 +410,142 @@ class BidirectionalBridge:
                         name=server_name,
                         command=command,
                         description=f"MCP server: {server_name}",
-                        status="stopped"
+                        status=MCPStatus.STOPPED
                     )
                     
                     servers.append(server)
-                    self.mcp_servers[server_id] = server
+                    self.add_mcp_server(server)
                 
-                self.save_data()
+                self.request_save()
                 return servers
         except Exception as e:
             logger.error(f"Error discovering MCP servers: {e}")
         return []
     
+    def _start_lock(self, server_id: str) -> asyncio.Lock:
+        """Per-server lock serializing startup of the same MCP server"""
+        return self._start_locks.setdefault(server_id, asyncio.Lock())
+    
     async def start_mcp_server(self, server_id: str) -> bool:
-        """Start an MCP server and establish connection"""
+        """Start an MCP server and establish a persistent connection"""
+        async with self._start_lock(server_id):
+            return await self._start_mcp_server(server_id)
+    
+    async def _start_mcp_server(self, server_id: str) -> bool:
+        """Start an MCP server; the caller must hold its start lock"""
         if server_id not in self.mcp_servers:
             return False
             
         server = self.mcp_servers[server_id]
         
         try:
-            from mcp import ClientSession, StdioServerParameters
-            from mcp.client.stdio import stdio_client
+            # Replace any session left over from a previous start
+            await self.close_mcp_session(server_id)
             
-            server.status = "starting"
+            self.set_mcp_status(server, MCPStatus.STARTING)
             
-            # Create server parameters
-            server_params = StdioServerParameters(
-                command=server.command[0],
-                args=server.command[1:],
-                env=dict(subprocess.os.environ)
-            )
+            # The session lives in its own task so its context managers are
+            # entered and exited in the same task
+            ready = asyncio.get_running_loop().create_future()
+            stop = asyncio.Event()
+            task = asyncio.create_task(self._run_mcp_session(server, ready, stop))
+            self._session_handles[server_id] = (task, stop)
+            session = await ready
             
-            # Start the MCP server process
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    # Initialize the session
-                    result = await session.initialize()
-                    
-                    # List available tools
-                    tools_result = await session.list_tools()
-                    server.tools = [
-                        {
-                            'name': tool.name,
-                            'description': tool.description,
-                            'input_schema': tool.inputSchema
-                        }
-                        for tool in tools_result.tools
-                    ]
-                    
-                    # Store the session for later use
-                    self.client_sessions[server_id] = session
-                    
-                    server.status = "running"
-                    server.last_health_check = datetime.now()
-                    self.save_data()
-                    
-                    logger.info(f"Started MCP server {server.name} with {len(server.tools)} tools")
-                    return True
+            # List available tools
+            tools_result = await session.list_tools()
+            self.set_mcp_tools(server, [
+                {
+                    'name': tool.name,
+                    'description': tool.description,
+                    'input_schema': tool.inputSchema
+                }
+                for tool in tools_result.tools
+            ])
+            
+            # Store the session for later use, evicting the least recently used
+            self.client_sessions[server_id] = session
+            await self._evict_idle_sessions(server_id)
+            
+            self.set_mcp_status(server, MCPStatus.RUNNING)
+            server.last_health_check = datetime.now()
+            self.request_save()
+            
+            logger.info(f"Started MCP server {server.name} with {len(server.tools)} tools")
+            return True
                     
         except Exception as e:
             logger.error(f"Failed to start MCP server {server.name}: {e}")
-            server.status = "error"
+            await self.close_mcp_session(server_id)
+            self.set_mcp_status(server, MCPStatus.ERROR)
             return False
     
+    async def _evict_idle_sessions(self, keep_id: str):
+        """Close least recently used sessions beyond MAX_MCP_SESSIONS, skipping busy ones"""
+        for evicted_id in list(self.client_sessions):
+            if len(self.client_sessions) <= MAX_MCP_SESSIONS:
+                break
+            lock = self._start_lock(evicted_id)
+            # Sessions with calls in flight or a start in progress are left alone (the limit is
+            # exceeded until they go idle); checking locked() first keeps two starts from deadlocking
+            if evicted_id == keep_id or self._session_users.get(evicted_id) or lock.locked():
+                continue
+            async with lock:
+                logger.info(f"Closing idle MCP session {evicted_id} (limit {MAX_MCP_SESSIONS})")
+                # Unlisted first, so new calls restart the server instead of using the closing session
+                self.client_sessions.pop(evicted_id, None)
+                await self.close_mcp_session(evicted_id)
+                if evicted_id in self.mcp_servers:
+                    self.set_mcp_status(self.mcp_servers[evicted_id], MCPStatus.STOPPED)
+    
+    async def _run_mcp_session(self, server: MCPServerInfo, ready: asyncio.Future,
+                               stop: asyncio.Event):
+        """Hold an MCP server process and client session open until stopped"""
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+        
+        server_params = StdioServerParameters(
+            command=server.command[0],
+            args=server.command[1:],
+            env=self._base_env
+        )
+        
+        session = None
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(stdio_client(server_params))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                ready.set_result(session)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"MCP session for {server.name} ended: {e}")
+        finally:
+            if not ready.done():
+                ready.set_exception(RuntimeError(f"MCP session for {server.name} exited"))
+            if session is not None and self.client_sessions.get(server.id) is session:
+                del self.client_sessions[server.id]
+                self.set_mcp_status(server, MCPStatus.STOPPED)
+    
+    async def close_mcp_session(self, server_id: str):
+        """Shut down the persistent session for an MCP server, if any"""
+        handle = self._session_handles.pop(server_id, None)
+        if handle is None:
+            return
+        task, stop = handle
+        stop.set()
+        try:
+            await task
+        except Exception as e:
+            logger.error(f"Error closing MCP session {server_id}: {e}")
+    
+    async def close_all_mcp_sessions(self):
+        """Shut down every persistent MCP session"""
+        await asyncio.gather(*(self.close_mcp_session(sid) for sid in list(self._session_handles)))
+    
     async def call_mcp_tool(self, request: MCPToolRequest) -> Dict[str, Any]:
         """Call a tool on an MCP server"""
         if request.server_id not in self.mcp_servers:
@@ -286,13 +553,24 @@ class BidirectionalBridge:
             
         server = self.mcp_servers[request.server_id]
         
-        if server.status != "running" or request.server_id not in self.client_sessions:
-            # Try to start the server
-            if not await self.start_mcp_server(request.server_id):
-                raise ValueError(f"Could not start MCP server {server.name}")
+        if server.status is not MCPStatus.RUNNING or request.server_id not in self.client_sessions:
+            async with self._start_lock(request.server_id):
+                # Re-check: a concurrent caller may have started it while we waited
+                if server.status is not MCPStatus.RUNNING or request.server_id not in self.client_sessions:
+                    if not await self._start_mcp_server(request.server_id):
+                        raise ValueError(f"Could not start MCP server {server.name}")
+        
+        session = self.client_sessions.get(request.server_id)
+        if session is None:
+            return {
+                "success": False,
+                "error": f"MCP server {server.name} session was closed"
+            }
         
+        # Counted as in use so LRU eviction won't close it mid-call
+        self._session_users[request.server_id] = self._session_users.get(request.server_id, 0) + 1
         try:
-            session = self.client_sessions[request.server_id]
+            self.client_sessions.move_to_end(request.server_id)
             result = await session.call_tool(request.tool_name, arguments=request.arguments)
             
             # Extract content from result
@@ -315,72 +593,150 @@ class BidirectionalBridge:
                 "success": False,
                 "error": str(e)
             }
+        finally:
+            users = self._session_users.pop(request.server_id) - 1
+            if users:
+                self._session_users[request.server_id] = users
     
-    async def call_openapi_endpoint(self, request: OpenAPICallRequest) -> Dict[str, Any]:
-        """Call an endpoint on an OpenAPI server"""
+    def _resolve_openapi_call(self, request: OpenAPICallRequest) -> Tuple[Dict, str]:
+        """Look up the endpoint for a call and build its target URL"""
         if request.server_id not in self.openapi_servers:
             raise ValueError(f"OpenAPI server {request.server_id} not found")
             
         server = self.openapi_servers[request.server_id]
         
         # Find the endpoint
-        endpoint = None
-        for ep in server.endpoints:
-            if ep['operation_id'] == request.operation_id:
-                endpoint = ep
-                break
-                
+        endpoint = server.endpoints_by_op.get(request.operation_id)
         if not endpoint:
             raise ValueError(f"Operation {request.operation_id} not found on server {server.name}")
         
+        # Build the URL, filling path parameters in a single pass
+        path = endpoint['path']
+        path_params = request.path_params
+        if path_params and '{' in path:
+            path = PATH_PARAM_RE.sub(
+                lambda m: quote(str(path_params[m.group(1)]), safe='/')
+                if m.group(1) in path_params else m.group(0),
+                path
+            )
+        
+        return endpoint, server.url_base + path
+    
+    async def _send_openapi_call(self, request: OpenAPICallRequest, endpoint: Dict, url: str) -> httpx.Response:
+        """Send a resolved OpenAPI call and read the response body"""
+        response = await self.http_client.request(
+            method=endpoint['method'],
+            url=url,
+            params=request.query_params or {},
+            json=request.body or {},
+            headers=request.headers or {},
+            timeout=PROXY_TIMEOUT
+        )
+        logger.debug(f"{endpoint['method']} {url} -> {response.status_code} ({response.http_version})")
+        return response
+    
+    async def call_openapi_endpoint_raw(self, request: OpenAPICallRequest) -> Tuple[int, bytes, httpx.Headers]:
+        """Call an endpoint on an OpenAPI server, returning the undecoded response"""
+        endpoint, url = self._resolve_openapi_call(request)
+        response = await self._send_openapi_call(request, endpoint, url)
+        return response.status_code, response.content, response.headers
+    
+    async def open_openapi_stream(self, request: OpenAPICallRequest) -> httpx.Response:
+        """Call an endpoint on an OpenAPI server without reading the body
+
+        The caller owns the returned response and must close it.
+        """
+        endpoint, url = self._resolve_openapi_call(request)
+        
+        upstream_request = self.http_client.build_request(
+            method=endpoint['method'],
+            url=url,
+            params=request.query_params or {},
+            json=request.body or {},
+            headers=request.headers or {},
+            timeout=PROXY_TIMEOUT
+        )
+        return await self.http_client.send(upstream_request, stream=True)
+    
+    async def call_openapi_endpoint(self, request: OpenAPICallRequest) -> bytes:
+        """Call an endpoint on an OpenAPI server, returning the JSON result envelope
+
+        A JSON upstream body is spliced into the envelope as-is rather than decoded
+        and re-encoded.
+        """
+        # Raises ValueError for unknown servers or operations
+        endpoint, url = self._resolve_openapi_call(request)
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Build the URL
-                url = server.base_url.rstrip('/') + endpoint['path']
-                
-                # Handle path parameters
-                if request.path_params:
-                    for key, value in request.path_params.items():
-                        url = url.replace(f'{{{key}}}', str(value))
-                
-                # Make the request
-                response = await client.request(
-                    method=endpoint['method'],
-                    url=url,
-                    params=request.query_params or {},
-                    json=request.body or {},
-                    headers=request.headers or {}
-                )
-                
-                return {
-                    "success": True,
-                    "status_code": response.status_code,
-                    "data": response.json() if response.content else None,
-                    "headers": dict(response.headers)
-                }
+            response = await self._send_openapi_call(request, endpoint, url)
+            content = response.content
+            
+            if not content:
+                data = b"null"
+            else:
+                if not _is_json_media_type(response.headers.get("content-type", "")):
+                    # Mislabelled bodies are still accepted if they parse; anything else is an error
+                    await asyncio.to_thread(orjson.loads, content)
+                data = content
+            
+            return b"".join((
+                b'{"success":true,"status_code":', str(response.status_code).encode(),
+                b',"data":', data,
+                b',"headers":', orjson.dumps(dict(response.headers)),
+                b'}'
+            ))
                 
         except Exception as e:
             logger.error(f"Error calling OpenAPI endpoint {request.operation_id}: {e}")
-            return {
+            return orjson.dumps({
                 "success": False,
                 "error": str(e)
-            }
+            })
+    
+    def add_mcp_server(self, server: MCPServerInfo):
+        """Register an MCP server, updating the stats counters"""
+        previous = self.mcp_servers.get(server.id)
+        if previous is not None:
+            self._running_mcp -= previous.status is MCPStatus.RUNNING
+            self._tool_count -= len(previous.tools)
+        self.mcp_servers[server.id] = server
+        self._running_mcp += server.status is MCPStatus.RUNNING
+        self._tool_count += len(server.tools)
+    
+    def add_openapi_server(self, server: OpenAPIServerInfo):
+        """Register an OpenAPI server, updating the stats counters"""
+        previous = self.openapi_servers.get(server.id)
+        if previous is not None:
+            self._online_openapi -= previous.status is OpenAPIStatus.ONLINE
+            self._endpoint_count -= len(previous.endpoints)
+        self.openapi_servers[server.id] = server
+        self._online_openapi += server.status is OpenAPIStatus.ONLINE
+        self._endpoint_count += len(server.endpoints)
+    
+    def set_mcp_status(self, server: MCPServerInfo, status: MCPStatus):
+        """Change an MCP server's status, updating the stats counters"""
+        if self.mcp_servers.get(server.id) is server:
+            self._running_mcp += (status is MCPStatus.RUNNING) - (server.status is MCPStatus.RUNNING)
+        server.status = status
+    
+    def set_mcp_tools(self, server: MCPServerInfo, tools: List[Dict]):
+        """Replace an MCP server's tool list, updating the stats counters"""
+        if self.mcp_servers.get(server.id) is server:
+            self._tool_count += len(tools) - len(server.tools)
+        server.tools = tools
     
     def get_stats(self) -> Dict[str, Any]:
         """Get bridge system statistics"""
-        running_mcp = sum(1 for s in self.mcp_servers.values() if s.status == "running")
-        online_openapi = sum(1 for s in self.openapi_servers.values() if s.status == "online")
-        
         return {
             "mcp_servers": {
                 "total": len(self.mcp_servers),
-                "running": running_mcp,
-                "tools_available": sum(len(s.tools) for s in self.mcp_servers.values())
+                "running": self._running_mcp,
+                "tools_available": self._tool_count
             },
             "openapi_servers": {
                 "total": len(self.openapi_servers),
-                "online": online_openapi,
-                "endpoints_available": sum(len(s.endpoints) for s in self.openapi_servers.values())
+                "online": self._online_openapi,
+                "endpoints_available": self._endpoint_count
             }
         }
 
@@ -402,6 +758,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _json_response(content: Any) -> Response:
+    """Encode a response body with orjson, which serializes the server dicts' datetimes natively"""
+    return Response(orjson.dumps(content), media_type="application/json")
+
+@app.on_event("startup")
+async def startup_event():
+    """Create the shared HTTP client and start the save loop"""
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=30),
+        timeout=PROXY_TIMEOUT
+    )
+    bridge.http_client = app.state.http_client
+    bridge.start_save_loop()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close MCP sessions, flush pending state and close the shared HTTP client"""
+    await bridge.close_all_mcp_sessions()
+    await bridge.stop_save_loop()
+    await app.state.http_client.aclose()
+    bridge.http_client = None
+
 @app.get("/")
 async def root():
     """Bridge system root endpoint"""
@@ -422,21 +801,21 @@ async def discover_all():
     openapi_servers = await bridge.discover_openapi_servers()
     mcp_servers = await bridge.discover_mcp_servers()
     
-    return {
-        "openapi_servers": [asdict(s) for s in openapi_servers],
-        "mcp_servers": [asdict(s) for s in mcp_servers],
+    return _json_response({
+        "openapi_servers": [s.to_dict() for s in openapi_servers],
+        "mcp_servers": [s.to_dict() for s in mcp_servers],
         "message": f"Discovered {len(openapi_servers)} OpenAPI servers and {len(mcp_servers)} MCP servers"
-    }
+    })
 
 @app.get("/mcp-servers")
 async def list_mcp_servers():
     """List all MCP servers"""
-    return {"servers": [asdict(s) for s in bridge.mcp_servers.values()]}
+    return _json_response({"servers": [s.to_dict() for s in bridge.mcp_servers.values()]})
 
 @app.get("/openapi-servers")
 async def list_openapi_servers():
     """List all OpenAPI servers"""
-    return {"servers": [asdict(s) for s in bridge.openapi_servers.values()]}
+    return _json_response({"servers": [s.to_dict() for s in bridge.openapi_servers.values()]})
 
 @app.post("/mcp-servers/{server_id}/start")
 async def start_mcp_server(server_id: str):
@@ -460,8 +839,7 @@ async def call_mcp_tool(request: MCPToolRequest):
 async def call_openapi_endpoint(request: OpenAPICallRequest):
     """Call an endpoint on an OpenAPI server"""
     try:
-        result = await bridge.call_openapi_endpoint(request)
-        return result
+        return Response(await bridge.call_openapi_endpoint(request), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -472,7 +850,7 @@ async def get_mcp_tools(server_id: str):
         raise HTTPException(status_code=404, detail="MCP server not found")
     
     server = bridge.mcp_servers[server_id]
-    return {"tools": server.tools}
+    return _json_response({"tools": server.tools})
 
 @app.get("/openapi-servers/{server_id}/endpoints")
 async def get_openapi_endpoints(server_id: str):
@@ -481,7 +859,7 @@ async def get_openapi_endpoints(server_id: str):
         raise HTTPException(status_code=404, detail="OpenAPI server not found")
     
     server = bridge.openapi_servers[server_id]
-    return {"endpoints": server.endpoints}
+    return _json_response({"endpoints": server.endpoints})
 
 # Add special endpoints that allow OpenAPI servers to call MCP tools
 @app.post("/proxy/mcp/{server_id}/{tool_name}")
@@ -513,8 +891,25 @@ async def proxy_openapi_call(
         body=body,
         headers=headers
     )
-    return await call_openapi_endpoint(request)
+    # Stream the upstream body through without buffering or re-encoding it
+    try:
+        upstream = await bridge.open_openapi_stream(request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    passthrough = {
+        name: upstream.headers[name]
+        for name in PROXY_PASSTHROUGH_HEADERS
+        if name in upstream.headers
+    }
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=passthrough,
+        background=BackgroundTask(upstream.aclose)
+    )
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8100)
+    # Single worker: MCP sessions and server state live in this process
+    uvicorn.run(app, host="0.0.0.0", port=8100, loop="uvloop", http="httptools")
 
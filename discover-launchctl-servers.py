@@ -7,21 +7,33 @@ and checking their actual running status and OpenAPI specifications.
 """
 
 import asyncio
-import json
+import concurrent.futures
+import os
+import plistlib
 import subprocess
-import xml.etree.ElementTree as ET
+import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-import httpx
+from typing import List, Dict, Optional, Tuple
 import argparse
 
+# The shared discovery module lives next to this script (resolve() follows symlinks)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from openapi_discovery import BaseDiscovery, json_dumps_pretty  # noqa: E402
 
-class LaunchCtlOpenAPIDiscovery:
+
+class LaunchCtlOpenAPIDiscovery(BaseDiscovery):
     """Tool for discovering OpenAPI servers managed by launchctl"""
     
     def __init__(self):
+        super().__init__()
         self.launch_agents_dir = Path.home() / "Library" / "LaunchAgents"
-        self.common_endpoints = ["/openapi.json", "/openapi.yaml", "/swagger.json", "/docs", "/api/docs"]
+        # Dedicated pool for plist parsing so a large LaunchAgents dir doesn't flood the default executor
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+        
+    async def aclose(self):
+        """Close the HTTP client and the plist parsing pool"""
+        await super().aclose()
+        self._pool.shutdown(wait=False)
         
     def get_running_services(self) -> Dict[str, Dict]:
         """Get currently running launchctl services"""
@@ -33,21 +45,16 @@ class LaunchCtlOpenAPIDiscovery:
                 check=True
             )
             
-            services = {}
-            for line in result.stdout.strip().split('\n')[1:]:  # Skip header
-                parts = line.split('\t')
-                if len(parts) >= 3:
-                    pid = parts[0].strip()
-                    exit_code = parts[1].strip()
-                    label = parts[2].strip()
-                    
-                    services[label] = {
-                        'pid': pid if pid != '-' else None,
-                        'exit_code': exit_code,
-                        'running': pid != '-'
-                    }
-                    
-            return services
+            # Columns are PID, Status, Label; skip the header row
+            return {
+                parts[2]: {
+                    'pid': parts[0] if parts[0] != '-' else None,
+                    'exit_code': parts[1],
+                    'running': parts[0] != '-'
+                }
+                for parts in (line.split('\t') for line in result.stdout.splitlines()[1:])
+                if len(parts) >= 3
+            }
             
         except subprocess.CalledProcessError as e:
             print(f"Error getting launchctl services: {e}")
@@ -56,45 +63,11 @@ class LaunchCtlOpenAPIDiscovery:
     def parse_plist_file(self, plist_path: Path) -> Optional[Dict]:
         """Parse a plist file and extract service configuration"""
         try:
-            tree = ET.parse(plist_path)
-            root = tree.getroot()
-            
-            # Find the main dict element
-            main_dict = root.find('.//dict')
-            if main_dict is None:
-                return None
+            with open(plist_path, 'rb') as f:
+                config = plistlib.load(f)
                 
-            config = {}
-            i = 0
-            children = list(main_dict)
-            
-            while i < len(children) - 1:
-                key_elem = children[i]
-                value_elem = children[i + 1]
-                
-                if key_elem.tag == 'key':
-                    key = key_elem.text
-                    
-                    if value_elem.tag == 'string':
-                        config[key] = value_elem.text
-                    elif value_elem.tag == 'array':
-                        config[key] = [child.text for child in value_elem if child.text]
-                    elif value_elem.tag == 'dict':
-                        # Parse nested dict (like EnvironmentVariables)
-                        nested_dict = {}
-                        j = 0
-                        nested_children = list(value_elem)
-                        while j < len(nested_children) - 1:
-                            nested_key = nested_children[j]
-                            nested_value = nested_children[j + 1]
-                            if nested_key.tag == 'key' and nested_value.tag == 'string':
-                                nested_dict[nested_key.text] = nested_value.text
-                            j += 2
-                        config[key] = nested_dict
-                    elif value_elem.tag in ['true', 'false']:
-                        config[key] = value_elem.tag == 'true'
-                        
-                i += 2
+            if not isinstance(config, dict):
+                return None
                 
             return config
             
@@ -147,43 +120,6 @@ class LaunchCtlOpenAPIDiscovery:
             'base_url': f"http://localhost:{port}" if port else None
         }
     
-    async def check_openapi_endpoint(self, base_url: str, endpoint: str) -> Optional[Dict]:
-        """Check if an endpoint returns valid OpenAPI spec"""
-        try:
-            url = f"{base_url.rstrip('/')}{endpoint}"
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url)
-                
-                if response.status_code == 200:
-                    if endpoint.endswith('.json'):
-                        try:
-                            data = response.json()
-                            if isinstance(data, dict) and ('openapi' in data or 'swagger' in data):
-                                return {
-                                    'spec_url': url,
-                                    'spec_data': data,
-                                    'title': data.get('info', {}).get('title', 'Unknown API'),
-                                    'description': data.get('info', {}).get('description', ''),
-                                    'version': data.get('info', {}).get('version', ''),
-                                    'openapi_version': data.get('openapi', data.get('swagger', ''))
-                                }
-                        except Exception:
-                            pass
-                    elif endpoint in ['/docs', '/api/docs']:
-                        # Check if it's a Swagger UI page
-                        if 'swagger' in response.text.lower() or 'openapi' in response.text.lower():
-                            return {
-                                'spec_url': url,
-                                'type': 'docs_page',
-                                'title': 'API Documentation',
-                                'description': 'Swagger/OpenAPI documentation page'
-                            }
-                            
-        except Exception:
-            pass
-            
-        return None
-    
     async def discover_openapi_for_service(self, service_info: Dict) -> Optional[Dict]:
         """Check if a service exposes OpenAPI spec"""
         if not service_info.get('base_url'):
@@ -192,26 +128,25 @@ class LaunchCtlOpenAPIDiscovery:
         base_url = service_info['base_url']
         
         # Try to find OpenAPI spec
-        for endpoint in self.common_endpoints:
-            result = await self.check_openapi_endpoint(base_url, endpoint)
-            if result:
-                # Merge service info with OpenAPI info
-                return {
-                    **service_info,
-                    **result,
-                    'has_openapi': True
-                }
+        result = await self.find_openapi_spec(base_url)
+        if result:
+            # Merge service info with OpenAPI info
+            return {
+                **service_info,
+                **result,
+                'has_openapi': True
+            }
                 
         # Check if service is responding at all
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(base_url)
-                return {
-                    **service_info,
-                    'responding': True,
-                    'status_code': response.status_code,
-                    'has_openapi': False
-                }
+            async with self._probe_semaphore:
+                response = await self.client.get(base_url, timeout=2.0)
+            return {
+                **service_info,
+                'responding': True,
+                'status_code': response.status_code,
+                'has_openapi': False
+            }
         except Exception:
             return {
                 **service_info,
@@ -221,16 +156,26 @@ class LaunchCtlOpenAPIDiscovery:
     
     async def discover_all_services(self) -> List[Dict]:
         """Discover all launchctl managed OpenAPI services"""
-        # Get running services
-        running_services = self.get_running_services()
+        # Find all com.davec plist files; scandir filters on names without a stat per entry
+        try:
+            with os.scandir(self.launch_agents_dir) as entries:
+                plist_files = [
+                    Path(entry.path) for entry in entries
+                    if entry.name.startswith('com.davec.') and entry.name.endswith('.plist')
+                ]
+        except FileNotFoundError:
+            plist_files = []
         
-        # Find all com.davec plist files
-        plist_files = list(self.launch_agents_dir.glob("com.davec.*.plist"))
+        # Query launchctl and parse the plists concurrently in worker threads
+        loop = asyncio.get_running_loop()
+        running_services, *configs = await asyncio.gather(
+            asyncio.to_thread(self.get_running_services),
+            *(loop.run_in_executor(self._pool, self.parse_plist_file, p) for p in plist_files)
+        )
         
         services = []
         
-        for plist_file in plist_files:
-            config = self.parse_plist_file(plist_file)
+        for plist_file, config in zip(plist_files, configs):
             if not config:
                 continue
                 
@@ -278,25 +223,17 @@ class LaunchCtlOpenAPIDiscovery:
             print("No OpenAPI services found to register")
             return
             
-        print(f"\\nRegistering {len(openapi_services)} OpenAPI services with registry at {registry_url}")
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for service in openapi_services:
-                try:
-                    if service.get('type') != 'docs_page':
-                        # Register server
-                        response = await client.post(
-                            f"{registry_url}/discover",
-                            params={"base_url": service['base_url']}
-                        )
-                        
-                        if response.status_code == 200:
-                            print(f"✅ Registered: {service.get('title', service['name'])} at {service['base_url']}")
-                        else:
-                            print(f"❌ Failed to register {service.get('title', service['name'])}: {response.text}")
-                            
-                except Exception as e:
-                    print(f"❌ Error registering {service.get('title', service['name'])}: {e}")
+        await super().register_with_registry(openapi_services, registry_url)
+    
+    async def start_service(self, service: Dict) -> Tuple[int, str]:
+        """Load a service's plist with launchctl, returning (returncode, stderr)"""
+        proc = await asyncio.create_subprocess_exec(
+            "launchctl", "load", f"/Users/davec/Library/LaunchAgents/{service['label']}.plist",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+        return proc.returncode, stderr.decode()
     
     def print_services(self, services: List[Dict]):
         """Print discovered services in a nice format"""
@@ -352,39 +289,35 @@ async def main():
     
     discovery = LaunchCtlOpenAPIDiscovery()
     
-    print("🔍 Discovering launchctl OpenAPI services...")
-    services = await discovery.discover_all_services()
-    
-    if args.json:
-        # Remove non-serializable data for JSON output
-        json_services = []
-        for service in services:
-            json_service = {k: v for k, v in service.items() if k != 'spec_data'}
-            json_services.append(json_service)
-        print(json.dumps(json_services, indent=2))
-    else:
-        discovery.print_services(services)
+    try:
+        print("🔍 Discovering launchctl OpenAPI services...")
+        services = await discovery.discover_all_services()
         
-    if args.register:
-        await discovery.register_with_registry(services, args.registry_url)
+        if args.json:
+            print(json_dumps_pretty(services))
+        else:
+            discovery.print_services(services)
+            
+        if args.register:
+            await discovery.register_with_registry(services, args.registry_url)
+    finally:
+        await discovery.aclose()
         
     if args.start_missing:
         stopped_services = [s for s in services if not s.get('running')]
         if stopped_services:
             print(f"\\n🚀 Starting {len(stopped_services)} stopped services...")
-            for service in stopped_services:
-                try:
-                    result = subprocess.run(
-                        ["launchctl", "load", f"/Users/davec/Library/LaunchAgents/{service['label']}.plist"],
-                        capture_output=True,
-                        text=True
-                    )
-                    if result.returncode == 0:
-                        print(f"✅ Started {service['name']}")
-                    else:
-                        print(f"❌ Failed to start {service['name']}: {result.stderr}")
-                except Exception as e:
-                    print(f"❌ Error starting {service['name']}: {e}")
+            results = await asyncio.gather(
+                *(discovery.start_service(service) for service in stopped_services),
+                return_exceptions=True
+            )
+            for service, result in zip(stopped_services, results):
+                if isinstance(result, Exception):
+                    print(f"❌ Error starting {service['name']}: {result}")
+                elif result[0] == 0:
+                    print(f"✅ Started {service['name']}")
+                else:
+                    print(f"❌ Failed to start {service['name']}: {result[1]}")
         
     openapi_services = [s for s in services if s.get('has_openapi')]
     if openapi_services and not args.register:
@@ -7,22 +7,44 @@ on your local system and can register them with the MCP Bridge Registry.
 """
 
 import asyncio
-import json
 import subprocess
+import sys
+from pathlib import Path
 from typing import List, Dict, Optional
-import httpx
 import argparse
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
-class OpenAPIDiscovery:
+
+# The shared discovery module lives next to this script (resolve() follows symlinks)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from openapi_discovery import BaseDiscovery, json_dumps_pretty  # noqa: E402
+
+
+class OpenAPIDiscovery(BaseDiscovery):
     """Tool for discovering OpenAPI servers on the local system"""
     
     def __init__(self):
+        super().__init__()
         self.common_ports = [8000, 8001, 8002, 8003, 8080, 8081, 8090, 3000, 3001, 5000, 5001]
-        self.common_endpoints = ["/openapi.json", "/openapi.yaml", "/swagger.json", "/docs", "/api/docs"]
         
     def get_listening_ports(self) -> List[int]:
         """Get list of ports with listening processes"""
+        if psutil is not None:
+            try:
+                # Reads the kernel socket table directly, no subprocess
+                return sorted({
+                    conn.laddr.port
+                    for conn in psutil.net_connections(kind='inet')
+                    if conn.status == psutil.CONN_LISTEN
+                })
+            except psutil.AccessDenied:
+                # macOS only exposes the system-wide table to root
+                pass
+        
         try:
             # Use lsof to find listening ports
             result = subprocess.run(
@@ -32,16 +54,14 @@ class OpenAPIDiscovery:
                 check=True
             )
             
-            ports = []
+            ports = set()
             for line in result.stdout.split('\n'):
                 if 'LISTEN' in line and ':' in line:
                     try:
                         # Extract port from lines like "TCP *:8000 (LISTEN)"
                         port_part = line.split()[-2]
                         if ':' in port_part:
-                            port = int(port_part.split(':')[-1])
-                            if port not in ports:
-                                ports.append(port)
+                            ports.add(int(port_part.split(':')[-1]))
                     except (ValueError, IndexError):
                         continue
                         
@@ -51,42 +71,15 @@ class OpenAPIDiscovery:
             print("Warning: Could not get listening ports, using common ports")
             return self.common_ports
     
-    async def check_openapi_endpoint(self, base_url: str, endpoint: str) -> Optional[Dict]:
-        """Check if an endpoint returns valid OpenAPI spec"""
+    async def _port_alive(self, port: int, timeout: float = 0.3) -> bool:
+        """Cheap TCP connect check so dead ports never reach the HTTP probes"""
         try:
-            url = f"{base_url.rstrip('/')}{endpoint}"
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url)
-                
-                if response.status_code == 200:
-                    if endpoint.endswith('.json'):
-                        try:
-                            data = response.json()
-                            if isinstance(data, dict) and ('openapi' in data or 'swagger' in data):
-                                return {
-                                    'spec_url': url,
-                                    'spec_data': data,
-                                    'title': data.get('info', {}).get('title', 'Unknown API'),
-                                    'description': data.get('info', {}).get('description', ''),
-                                    'version': data.get('info', {}).get('version', ''),
-                                    'openapi_version': data.get('openapi', data.get('swagger', ''))
-                                }
-                        except Exception:
-                            pass
-                    elif endpoint in ['/docs', '/api/docs']:
-                        # Check if it's a Swagger UI page
-                        if 'swagger' in response.text.lower() or 'openapi' in response.text.lower():
-                            return {
-                                'spec_url': url,
-                                'type': 'docs_page',
-                                'title': 'API Documentation',
-                                'description': 'Swagger/OpenAPI documentation page'
-                            }
-                            
-        except Exception as e:
-            pass
-            
-        return None
+            _, writer = await asyncio.wait_for(asyncio.open_connection('localhost', port), timeout)
+            writer.close()
+            await writer.wait_closed()
+            return True
+        except Exception:
+            return False
     
     async def discover_server(self, port: int) -> Optional[Dict]:
         """Discover OpenAPI server on a specific port"""
@@ -94,33 +87,36 @@ class OpenAPIDiscovery:
         
         # Check if port is responding
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(base_url)
-                if response.status_code >= 500:
-                    return None
+            async with self._probe_semaphore:
+                response = await self.client.get(base_url, timeout=2.0)
+            if response.status_code >= 500:
+                return None
         except Exception:
             return None
         
         # Try to find OpenAPI spec
-        for endpoint in self.common_endpoints:
-            result = await self.check_openapi_endpoint(base_url, endpoint)
-            if result:
-                result['base_url'] = base_url
-                result['port'] = port
-                return result
+        result = await self.find_openapi_spec(base_url)
+        if result:
+            result['base_url'] = base_url
+            result['port'] = port
+            return result
                 
         return None
     
     async def discover_all_servers(self, ports: Optional[List[int]] = None) -> List[Dict]:
         """Discover all OpenAPI servers on specified or common ports"""
         if ports is None:
-            ports = self.get_listening_ports()
+            ports = await asyncio.to_thread(self.get_listening_ports)
             # Also check common ports that might not be in lsof output
-            for port in self.common_ports:
-                if port not in ports:
-                    ports.append(port)
+            ports = sorted(set(ports) | set(self.common_ports))
+        else:
+            ports = sorted(set(ports))
+        
+        print(f"Scanning ports: {ports}")
         
-        print(f"Scanning ports: {sorted(ports)}")
+        # Drop ports nothing is listening on before paying for HTTP requests
+        alive = await asyncio.gather(*(self._port_alive(p) for p in ports))
+        ports = [p for p, is_alive in zip(ports, alive) if is_alive]
         
         tasks = [self.discover_server(port) for port in ports]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -134,28 +130,6 @@ class OpenAPIDiscovery:
                 
         return servers
     
-    async def register_with_registry(self, servers: List[Dict], registry_url: str = "http://localhost:9000"):
-        """Register discovered servers with the MCP Bridge Registry"""
-        print(f"\nRegistering {len(servers)} servers with registry at {registry_url}")
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for server in servers:
-                try:
-                    if 'spec_url' in server and server.get('type') != 'docs_page':
-                        # Register server
-                        response = await client.post(
-                            f"{registry_url}/discover",
-                            params={"base_url": server['base_url']}
-                        )
-                        
-                        if response.status_code == 200:
-                            print(f"✅ Registered: {server['title']} at {server['base_url']}")
-                        else:
-                            print(f"❌ Failed to register {server['title']}: {response.text}")
-                            
-                except Exception as e:
-                    print(f"❌ Error registering {server.get('title', 'Unknown')}: {e}")
-    
     def print_servers(self, servers: List[Dict]):
         """Print discovered servers in a nice format"""
         if not servers:
@@ -190,16 +164,19 @@ async def main():
     
     discovery = OpenAPIDiscovery()
     
-    print("🔍 Discovering OpenAPI servers...")
-    servers = await discovery.discover_all_servers(args.ports)
-    
-    if args.json:
-        print(json.dumps(servers, indent=2))
-    else:
-        discovery.print_servers(servers)
+    try:
+        print("🔍 Discovering OpenAPI servers...")
+        servers = await discovery.discover_all_servers(args.ports)
         
-    if args.register and servers:
-        await discovery.register_with_registry(servers, args.registry_url)
+        if args.json:
+            print(json_dumps_pretty(servers))
+        else:
+            discovery.print_servers(servers)
+            
+        if args.register and servers:
+            await discovery.register_with_registry(servers, args.registry_url)
+    finally:
+        await discovery.aclose()
         
     if servers and not args.register:
         print(f"\n💡 To register these servers with the MCP Bridge Registry, run:")
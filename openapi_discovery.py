@@ -0,0 +1,174 @@
+"""
+Shared OpenAPI discovery logic
+
+Common probing and registry-registration code used by discover-servers.py and
+discover-launchctl-servers.py. Keep this file next to those scripts (or
+symlink it alongside them) so they can import it.
+"""
+
+import asyncio
+import json
+import re
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Upper bound on simultaneous HTTP probes; keeps well under macOS's default
+# 256 open-file limit and matches the client's connection pool size
+MAX_CONCURRENT_PROBES = 64
+
+# Bytes of a probe response inspected before deciding whether to read the rest
+SNIFF_BYTES = 4096
+
+# Markers identifying a Swagger UI / OpenAPI documentation page
+_DOCS_SNIFF = re.compile(rb'swagger|openapi', re.IGNORECASE)
+
+
+def json_loads(data: bytes):
+    """Decode JSON with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj) -> str:
+    """Encode JSON indented by two spaces, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+async def _read_prefix(chunks: AsyncIterator[bytes], size: int) -> bytes:
+    """Read at least size bytes (or the whole body, if shorter) from a byte stream"""
+    head = b""
+    while len(head) < size:
+        try:
+            head += await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+    return head
+
+
+def _display_name(server: Dict) -> str:
+    """Human-readable name for a discovered server"""
+    return server.get('title') or server.get('name', 'Unknown')
+
+
+class BaseDiscovery:
+    """Probing and registration shared by the discovery tools
+
+    Subclasses decide which base URLs to probe.
+    """
+    
+    def __init__(self):
+        self.common_endpoints = ["/openapi.json", "/openapi.yaml", "/swagger.json", "/docs", "/api/docs"]
+        # Shared client so probes reuse keep-alive connections
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONCURRENT_PROBES, max_keepalive_connections=MAX_CONCURRENT_PROBES),
+            timeout=httpx.Timeout(5.0, connect=2.0)
+        )
+        self._probe_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        # Base URLs whose servers reject HEAD requests
+        self._head_unsupported: Set[str] = set()
+        # Probe results by (base_url, endpoint), so no URL is fetched twice per run
+        self._probe_cache: Dict[Tuple[str, str], Optional[Dict]] = {}
+        
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self.client.aclose()
+    
+    async def check_openapi_endpoint(self, base_url: str, endpoint: str) -> Optional[Dict]:
+        """Check if an endpoint returns valid OpenAPI spec, probing each URL at most once"""
+        key = (base_url, endpoint)
+        if key not in self._probe_cache:
+            async with self._probe_semaphore:
+                self._probe_cache[key] = await self._probe_endpoint(base_url, endpoint)
+        return self._probe_cache[key]
+    
+    async def _probe_endpoint(self, base_url: str, endpoint: str) -> Optional[Dict]:
+        """Fetch an endpoint and return its OpenAPI details, if it has any"""
+        try:
+            url = f"{base_url.rstrip('/')}{endpoint}"
+            
+            # A HEAD rules out missing routes without the server rendering a body
+            if base_url not in self._head_unsupported:
+                head_response = await self.client.head(url)
+                if head_response.status_code in (405, 501):
+                    # e.g. FastAPI, which does not route HEAD; use GET for this server from now on
+                    self._head_unsupported.add(base_url)
+                elif head_response.status_code != 200:
+                    return None
+            
+            async with self.client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return None
+                
+                chunks = response.aiter_bytes()
+                head = await _read_prefix(chunks, SNIFF_BYTES)
+                
+                if endpoint.endswith('.json'):
+                    # Skip the full download and parse unless the spec markers appear up front
+                    if b'"openapi"' not in head and b'"swagger"' not in head:
+                        return None
+                    try:
+                        body = head + b"".join([chunk async for chunk in chunks])
+                        data = json_loads(body)
+                        if isinstance(data, dict) and ('openapi' in data or 'swagger' in data):
+                            return {
+                                'spec_url': url,
+                                'title': data.get('info', {}).get('title', 'Unknown API'),
+                                'description': data.get('info', {}).get('description', ''),
+                                'version': data.get('info', {}).get('version', ''),
+                                'openapi_version': data.get('openapi', data.get('swagger', ''))
+                            }
+                    except Exception:
+                        pass
+                elif endpoint in ['/docs', '/api/docs']:
+                    # Check if it's a Swagger UI page
+                    if _DOCS_SNIFF.search(head):
+                        return {
+                            'spec_url': url,
+                            'type': 'docs_page',
+                            'title': 'API Documentation',
+                            'description': 'Swagger/OpenAPI documentation page'
+                        }
+                        
+        except Exception:
+            pass
+            
+        return None
+    
+    async def find_openapi_spec(self, base_url: str) -> Optional[Dict]:
+        """Probe all common endpoints concurrently; the earliest listed match wins"""
+        results = await asyncio.gather(
+            *(self.check_openapi_endpoint(base_url, endpoint) for endpoint in self.common_endpoints),
+            return_exceptions=True
+        )
+        return next((r for r in results if isinstance(r, dict)), None)
+    
+    async def register_with_registry(self, servers: List[Dict], registry_url: str = "http://localhost:9000"):
+        """Register discovered servers with the MCP Bridge Registry"""
+        print(f"\nRegistering {len(servers)} servers with registry at {registry_url}")
+        
+        for server in servers:
+            try:
+                if 'spec_url' in server and server.get('type') != 'docs_page':
+                    # Register server
+                    response = await self.client.post(
+                        f"{registry_url}/discover",
+                        params={"base_url": server['base_url']},
+                        timeout=10.0
+                    )
+                    
+                    if response.status_code == 200:
+                        print(f"✅ Registered: {_display_name(server)} at {server['base_url']}")
+                    else:
+                        print(f"❌ Failed to register {_display_name(server)}: {response.text}")
+                        
+            except Exception as e:
+                print(f"❌ Error registering {_display_name(server)}: {e}")
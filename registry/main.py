@@ -8,22 +8,35 @@ MCP bridge configurations.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
-import subprocess
+import os
+import re
+import signal
+import sqlite3
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 from urllib.parse import urlparse
 
 import httpx
+import ijson
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, HttpUrl
 import uvicorn
 
+# C-level ISO-8601 parser when available; fromisoformat reads everything this service writes
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,9 +44,78 @@ logger = logging.getLogger(__name__)
 # Suppress noisy httpx logs for health checks
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# Minimum seconds between writes of the registry data files
+SAVE_INTERVAL = 2.0
+
+# Seconds a successful discovery is reused for the same base URL
+DISCOVERY_CACHE_TTL = 300
+
+# Upper bound on servers probed at once during a health sweep
+MAX_CONCURRENT_HEALTH_CHECKS = 50
+
+# Server ids written before stable ids: "<name>_<hash(base_url) % 10000>"
+LEGACY_SERVER_ID_RE = re.compile(r'_\d{1,4}$')
+
+# Discovery first asks for just this much of a spec; info normally sits at the top
+SPEC_PREFIX_BYTES = 131072
+
+# SQLite schema; the in-memory dicts stay authoritative and the database is written through
+SERVER_COLUMNS = ("id", "name", "base_url", "openapi_url", "description", "tags_json",
+                  "health_endpoint", "last_seen", "status")
+BRIDGE_COLUMNS = ("id", "name", "server_id", "port", "process_id", "status", "created_at",
+                  "last_health_check")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    id TEXT PRIMARY KEY, name TEXT, base_url TEXT, openapi_url TEXT, description TEXT,
+    tags_json TEXT, health_endpoint TEXT, last_seen TEXT, status TEXT
+);
+CREATE TABLE IF NOT EXISTS bridges (
+    id TEXT PRIMARY KEY, name TEXT, server_id TEXT, port INTEGER, process_id INTEGER,
+    status TEXT, created_at TEXT, last_health_check TEXT
+);
+"""
+UPSERT_SERVER_SQL = f"INSERT OR REPLACE INTO servers VALUES ({', '.join('?' * len(SERVER_COLUMNS))})"
+UPSERT_BRIDGE_SQL = f"INSERT OR REPLACE INTO bridges VALUES ({', '.join('?' * len(BRIDGE_COLUMNS))})"
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    return parse_datetime(value) if value else None
+
+# Interned status values: statuses loaded from disk share these objects, so compares hit the identity fast path
+_STATUS_UNKNOWN = sys.intern("unknown")
+_STATUS_ONLINE = sys.intern("online")
+_STATUS_OFFLINE = sys.intern("offline")
+_STATUS_ERROR = sys.intern("error")
+_STATUS_STOPPED = sys.intern("stopped")
+_STATUS_STARTING = sys.intern("starting")
+_STATUS_RUNNING = sys.intern("running")
+
+def server_id_for(base_url: str) -> str:
+    """Stable server id derived from the base URL (builtin hash() changes per process)"""
+    return hashlib.blake2b(base_url.encode(), digest_size=8).hexdigest()
+
 # Data Models
-@dataclass
-class OpenAPIServer:
+class _DictCacheMixin:
+    """Memoizes asdict() output, invalidated whenever an attribute is assigned"""
+    
+    __slots__ = ('_cached_dict',)
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_cached_dict', None)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the cached dict form; callers must not mutate it"""
+        cached = getattr(self, '_cached_dict', None)
+        if cached is None:
+            cached = asdict(self)
+            object.__setattr__(self, '_cached_dict', cached)
+        return cached
+
+@dataclass(slots=True)
+class OpenAPIServer(_DictCacheMixin):
     """Represents an OpenAPI server configuration"""
     name: str
     base_url: str
@@ -42,24 +124,73 @@ class OpenAPIServer:
     tags: List[str] = None
     health_endpoint: str = "/health"
     last_seen: Optional[datetime] = None
-    status: str = "unknown"  # unknown, online, offline, error
+    status: str = _STATUS_UNKNOWN  # unknown, online, offline, error
     
     def __post_init__(self):
         if self.tags is None:
             self.tags = []
+        self.status = sys.intern(self.status)
 
-@dataclass 
-class MCPBridge:
+@dataclass(slots=True)
+class MCPBridge(_DictCacheMixin):
     """Represents an MCP bridge configuration"""
     id: str
     name: str
-    openapi_server: OpenAPIServer
-    bridge_url: str
+    server_id: str  # key into registry.servers; the server itself is stored once
+    port: int
     process_id: Optional[int] = None
-    status: str = "stopped"  # stopped, starting, running, error
+    status: str = _STATUS_STOPPED  # stopped, starting, running, error
     created_at: Optional[datetime] = None
     last_health_check: Optional[datetime] = None
     
+    def __post_init__(self):
+        self.status = sys.intern(self.status)
+    
+    @property
+    def bridge_url(self) -> str:
+        """URL the bridge listens on, derived from its port"""
+        return f"http://localhost:{self.port}"
+    
+    @property
+    def openapi_server(self) -> OpenAPIServer:
+        """The registered server this bridge fronts"""
+        return registry.servers[self.server_id]
+    
+    def as_response_dict(self) -> Dict[str, Any]:
+        """Bridge fields with the referenced server embedded, for API responses"""
+        return {**self.as_dict(), "bridge_url": self.bridge_url, "openapi_server": self.openapi_server.as_dict()}
+    
+class _AsyncResponseReader:
+    """Async file-like adapter over a streamed httpx response, for ijson"""
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk for it
+        if size == 0:
+            return b""
+        # ijson treats b"" as EOF, so skip any empty chunks the stream yields
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+async def _scan_spec_info(response: httpx.Response) -> Optional[Dict[str, str]]:
+    """Parse a streamed spec only until info.title/description are read; None if it isn't a spec"""
+    info: Dict[str, str] = {}
+    is_spec = info_done = False
+    async for prefix, event, value in ijson.parse(_AsyncResponseReader(response)):
+        if prefix == '' and event == 'map_key' and value in ('openapi', 'swagger'):
+            is_spec = True
+        elif prefix in ('info.title', 'info.description') and event == 'string':
+            info[prefix[5:]] = value
+        elif prefix == 'info' and event == 'end_map':
+            info_done = True
+        if is_spec and info_done:
+            break
+    return info if is_spec else None
+
 class BridgeRequest(BaseModel):
     """Request to create a new bridge"""
     openapi_url: HttpUrl
@@ -88,143 +219,362 @@ class MCPBridgeRegistry:
         self.next_port = bridge_port_start
         self.start_time = time.time()
         
+        # Stats counters, kept in step by add_*/remove_bridge and the status setters
+        self._online_servers = 0
+        self._running_bridges = 0
+        
+        # Shared HTTP client for discovery and health probes, created on startup
+        self.http: Optional[httpx.AsyncClient] = None
+        
+        # Mutations only record which rows changed; _flush_loop writes them out
+        self._dirty_servers: set = set()
+        self._dirty_bridges: set = set()
+        self._deleted_bridges: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Live process handles for bridges started by this process (only the PID is persisted)
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+        
+        # Minimal environment bridge processes inherit, captured once
+        self._base_env = {
+            "PATH": os.environ.get("PATH", ""),
+            "HOME": os.environ.get("HOME", ""),
+            "NODE_ENV": os.environ.get("NODE_ENV", "production"),
+        }
+        
+        # base_url -> (discovered at, server) for recent successful discoveries
+        self._discover_cache: Dict[str, Tuple[float, OpenAPIServer]] = {}
+        
+        # openapi_url -> last seen ETag, plus the info block read with it, for conditional GETs
+        self._spec_etag: Dict[str, str] = {}
+        self._spec_info: Dict[str, Dict[str, str]] = {}
+        
+        # Probe URLs that answered HEAD with 405/501; those go straight to GET
+        self._head_unsupported: set = set()
+        
+        # Pre-rendered GET /servers and GET /bridges bodies, dropped on any change they reflect
+        self._servers_resp_cache: Optional[bytes] = None
+        self._bridges_resp_cache: Optional[bytes] = None
+        
         # Load existing data
-        self.load_data()
+        db_path = self.data_dir / "registry.db"
+        fresh_db = not db_path.exists()
+        # Only ever used from the event loop, which may not be the thread that built the registry
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        if fresh_db:
+            self.import_json_data()
+        else:
+            self.load_data()
         
+    @property
+    def _dirty(self) -> bool:
+        """Whether any row changes are waiting to be written"""
+        return bool(self._dirty_servers or self._dirty_bridges or self._deleted_bridges)
+    
     def load_data(self):
         """Load persisted registry data"""
+        try:
+            self._db.row_factory = sqlite3.Row
+            for row in self._db.execute("SELECT * FROM servers"):
+                data = dict(row)
+                server_id = data.pop("id")
+                data["tags"] = orjson.loads(data.pop("tags_json") or "[]")
+                data["last_seen"] = _parse_iso(data["last_seen"])
+                self.add_server(server_id, OpenAPIServer(**data))
+                
+            for row in self._db.execute("SELECT * FROM bridges"):
+                data = dict(row)
+                data["created_at"] = _parse_iso(data["created_at"])
+                data["last_health_check"] = _parse_iso(data["last_health_check"])
+                self.add_bridge(MCPBridge(**data))
+                
+            logger.info(f"Loaded {len(self.servers)} servers and {len(self.bridges)} bridges")
+        except Exception as e:
+            logger.error(f"Error loading data: {e}")
+        finally:
+            self._db.row_factory = None
+    
+    def import_json_data(self):
+        """Import servers.json/bridges.json written before the SQLite store"""
         try:
             servers_file = self.data_dir / "servers.json"
             if servers_file.exists():
-                with open(servers_file) as f:
-                    data = json.load(f)
+                with open(servers_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     for server_id, server_data in data.items():
                         # Convert datetime strings back to datetime objects
                         if server_data.get("last_seen"):
-                            server_data["last_seen"] = datetime.fromisoformat(server_data["last_seen"])
-                        self.servers[server_id] = OpenAPIServer(**server_data)
+                            server_data["last_seen"] = parse_datetime(server_data["last_seen"])
+                        server = OpenAPIServer(**server_data)
+                        if LEGACY_SERVER_ID_RE.search(server_id):
+                            # Re-key legacy ids; duplicates of the same URL collapse into one entry
+                            server_id = server_id_for(server.base_url)
+                        self.add_server(server_id, server)
                         
             bridges_file = self.data_dir / "bridges.json" 
             if bridges_file.exists():
-                with open(bridges_file) as f:
-                    data = json.load(f)
+                with open(bridges_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     for bridge_id, bridge_data in data.items():
                         # Convert datetime strings and reconstruct objects
                         if bridge_data.get("created_at"):
-                            bridge_data["created_at"] = datetime.fromisoformat(bridge_data["created_at"])
+                            bridge_data["created_at"] = parse_datetime(bridge_data["created_at"])
                         if bridge_data.get("last_health_check"):
-                            bridge_data["last_health_check"] = datetime.fromisoformat(bridge_data["last_health_check"])
+                            bridge_data["last_health_check"] = parse_datetime(bridge_data["last_health_check"])
                         
-                        # Reconstruct OpenAPIServer object
-                        server_data = bridge_data["openapi_server"]
-                        if server_data.get("last_seen"):
-                            server_data["last_seen"] = datetime.fromisoformat(server_data["last_seen"])
-                        bridge_data["openapi_server"] = OpenAPIServer(**server_data)
+                        # Older files store the URL rather than the port
+                        if "bridge_url" in bridge_data:
+                            bridge_data["port"] = urlparse(bridge_data.pop("bridge_url")).port
                         
-                        self.bridges[bridge_id] = MCPBridge(**bridge_data)
+                        # Older files embed a full server copy in each bridge; store it once and reference it
+                        server_data = bridge_data.pop("openapi_server", None)
+                        if server_data is not None:
+                            bridge_data["server_id"] = server_id_for(server_data["base_url"])
+                            if bridge_data["server_id"] not in self.servers:
+                                if server_data.get("last_seen"):
+                                    server_data["last_seen"] = parse_datetime(server_data["last_seen"])
+                                self.add_server(bridge_data["server_id"], OpenAPIServer(**server_data))
                         
-            logger.info(f"Loaded {len(self.servers)} servers and {len(self.bridges)} bridges")
+                        self.add_bridge(MCPBridge(**bridge_data))
+                        
+            # Everything imported goes into the database on the first flush
+            self._dirty_servers.update(self.servers)
+            self._dirty_bridges.update(self.bridges)
+            logger.info(f"Imported {len(self.servers)} servers and {len(self.bridges)} bridges from JSON")
         except Exception as e:
             logger.error(f"Error loading data: {e}")
     
     def save_data(self):
-        """Persist registry data"""
+        """Persist changed rows in a single transaction"""
+        servers, self._dirty_servers = self._dirty_servers, set()
+        bridges, self._dirty_bridges = self._dirty_bridges, set()
+        deleted, self._deleted_bridges = self._deleted_bridges, set()
         try:
-            # Custom encoder for datetime objects
-            def json_encoder(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, OpenAPIServer):
-                    return asdict(obj)
-                elif isinstance(obj, MCPBridge):
-                    data = asdict(obj)
-                    return data
-                return obj
-            
-            servers_file = self.data_dir / "servers.json"
-            with open(servers_file, 'w') as f:
-                json.dump({k: asdict(v) for k, v in self.servers.items()}, f, default=json_encoder, indent=2)
-                
-            bridges_file = self.data_dir / "bridges.json"
-            with open(bridges_file, 'w') as f:
-                json.dump({k: asdict(v) for k, v in self.bridges.items()}, f, default=json_encoder, indent=2)
-                
+            with self._db:
+                self._db.executemany(UPSERT_SERVER_SQL, [
+                    self._server_row(server_id, self.servers[server_id])
+                    for server_id in servers if server_id in self.servers
+                ])
+                self._db.executemany(UPSERT_BRIDGE_SQL, [
+                    self._bridge_row(self.bridges[bridge_id])
+                    for bridge_id in bridges if bridge_id in self.bridges
+                ])
+                self._db.executemany("DELETE FROM bridges WHERE id = ?", [(bridge_id,) for bridge_id in deleted])
         except Exception as e:
             logger.error(f"Error saving data: {e}")
+            # Keep the rows pending so the next flush retries them
+            self._dirty_servers |= servers
+            self._dirty_bridges |= bridges
+            self._deleted_bridges |= deleted
+    
+    @staticmethod
+    def _server_row(server_id: str, server: OpenAPIServer) -> tuple:
+        return (server_id, server.name, server.base_url, server.openapi_url, server.description,
+                orjson.dumps(server.tags).decode(), server.health_endpoint, _iso(server.last_seen),
+                server.status)
+    
+    @staticmethod
+    def _bridge_row(bridge: MCPBridge) -> tuple:
+        return (bridge.id, bridge.name, bridge.server_id, bridge.port, bridge.process_id,
+                bridge.status, _iso(bridge.created_at), _iso(bridge.last_health_check))
     
-    async def discover_openapi_server(self, base_url: str) -> Optional[OpenAPIServer]:
+    def mark_server_dirty(self, server_id: str):
+        """Flag a server row as changed so the next flush persists it"""
+        self._dirty_servers.add(server_id)
+        self._invalidate_server_responses()
+    
+    def mark_bridge_dirty(self, bridge_id: str):
+        """Flag a bridge row as changed so the next flush persists it"""
+        self._dirty_bridges.add(bridge_id)
+        self._bridges_resp_cache = None
+    
+    def _invalidate_server_responses(self):
+        # Bridge responses embed their server, so both bodies go stale
+        self._servers_resp_cache = None
+        self._bridges_resp_cache = None
+    
+    def render_servers(self) -> bytes:
+        """JSON body for GET /servers, re-rendered only after a change"""
+        if self._servers_resp_cache is None:
+            self._servers_resp_cache = orjson.dumps(
+                {"servers": [server.as_dict() for server in self.servers.values()]}
+            )
+        return self._servers_resp_cache
+    
+    def render_bridges(self) -> bytes:
+        """JSON body for GET /bridges, re-rendered only after a change"""
+        if self._bridges_resp_cache is None:
+            self._bridges_resp_cache = orjson.dumps(
+                {"bridges": [bridge.as_response_dict() for bridge in self.bridges.values()]}
+            )
+        return self._bridges_resp_cache
+    
+    def _flush_now(self):
+        """Persist pending changes immediately"""
+        self.save_data()
+    
+    async def _flush_loop(self):
+        """Coalesce writes to at most one per SAVE_INTERVAL, skipping idle intervals"""
+        while True:
+            await asyncio.sleep(SAVE_INTERVAL)
+            if self._dirty:
+                self._flush_now()
+    
+    async def discover_openapi_server(self, base_url: str, force: bool = False) -> Optional[OpenAPIServer]:
         """Discover OpenAPI server by probing common endpoints"""
+        cache_key = base_url.rstrip('/')
+        entry = self._discover_cache.get(cache_key)
+        if entry and not force and time.time() - entry[0] < DISCOVERY_CACHE_TTL:
+            # Hand out a copy; callers override fields like name and tags
+            return replace(entry[1])
+        
+        server = await self._probe_openapi_server(base_url)
+        if server:
+            self._discover_cache[cache_key] = (time.time(), replace(server))
+        return server
+    
+    async def _probe_openapi_server(self, base_url: str) -> Optional[OpenAPIServer]:
+        """Probe common spec endpoints for an OpenAPI server"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Try common OpenAPI spec endpoints
-                spec_endpoints = ["/openapi.json", "/openapi.yaml", "/swagger.json", "/docs", "/api/docs"]
-                
-                for endpoint in spec_endpoints:
-                    try:
-                        spec_url = f"{base_url.rstrip('/')}{endpoint}"
-                        response = await client.get(spec_url)
-                        if response.status_code == 200:
-                            if endpoint.endswith(('.json', '.yaml')):
-                                # Found OpenAPI spec
-                                spec_data = response.json() if endpoint.endswith('.json') else response.text
-                                if isinstance(spec_data, dict) and ('openapi' in spec_data or 'swagger' in spec_data):
-                                    server_name = spec_data.get('info', {}).get('title', f"Server at {base_url}")
-                                    description = spec_data.get('info', {}).get('description', "")
-                                    
-                                    return OpenAPIServer(
-                                        name=server_name,
-                                        base_url=base_url,
-                                        openapi_url=spec_url,
-                                        description=description,
-                                        last_seen=datetime.now(),
-                                        status="online"
-                                    )
-                    except Exception:
-                        continue
-                        
+            client = self.http
+            # Try common OpenAPI spec endpoints
+            spec_endpoints = ["/openapi.json", "/openapi.yaml", "/swagger.json", "/docs", "/api/docs"]
+            
+            for endpoint in spec_endpoints:
+                # Only a JSON spec can identify the server; YAML and docs pages were never parsed
+                if not endpoint.endswith('.json'):
+                    continue
+                try:
+                    spec_url = f"{base_url.rstrip('/')}{endpoint}"
+                    info = await self._read_spec_info(client, spec_url)
+                    if info is not None:
+                        # Found OpenAPI spec
+                        return OpenAPIServer(
+                            name=info.get('title', f"Server at {base_url}"),
+                            base_url=base_url,
+                            openapi_url=spec_url,
+                            description=info.get('description', ""),
+                            last_seen=datetime.now(),
+                            status=_STATUS_ONLINE
+                        )
+                except Exception:
+                    continue
+                    
         except Exception as e:
             logger.error(f"Error discovering server at {base_url}: {e}")
         
         return None
     
+    async def _read_spec_info(self, client: httpx.AsyncClient, spec_url: str) -> Optional[Dict[str, str]]:
+        """Read a spec's info block from a ranged prefix, refetching in full only if the prefix falls short"""
+        headers = {"Range": f"bytes=0-{SPEC_PREFIX_BYTES - 1}"}
+        if spec_url in self._spec_info and spec_url in self._spec_etag:
+            headers["If-None-Match"] = self._spec_etag[spec_url]
+        
+        async with client.stream("GET", spec_url, headers=headers, timeout=10.0) as response:
+            if response.status_code == 304:
+                return self._spec_info[spec_url]
+            if response.status_code in (200, 206):
+                try:
+                    info = await _scan_spec_info(response)
+                except ijson.IncompleteJSONError:
+                    # A 200 means the whole body was sent, so it really is truncated
+                    if response.status_code == 200:
+                        return None
+                else:
+                    self._remember_spec_etag(spec_url, response, info)
+                    return info
+            elif response.status_code != 416:
+                return None
+        
+        # Range not satisfiable, or the info block lies past the prefix
+        async with client.stream("GET", spec_url, timeout=10.0) as response:
+            if response.status_code != 200:
+                return None
+            info = await _scan_spec_info(response)
+            self._remember_spec_etag(spec_url, response, info)
+            return info
+    
+    def _remember_spec_etag(self, spec_url: str, response: httpx.Response, info: Optional[Dict[str, str]] = None):
+        """Record a spec's ETag (and its info block, when read) for later conditional GETs"""
+        etag = response.headers.get("ETag")
+        if etag:
+            self._spec_etag[spec_url] = etag
+        else:
+            self._spec_etag.pop(spec_url, None)
+        # A 304 reuses the cached info, so it must have been read under this same ETag;
+        # a fresh body without a readable info block drops the old one
+        if etag and info is not None:
+            self._spec_info[spec_url] = info
+        else:
+            self._spec_info.pop(spec_url, None)
+    
+    async def _probe_health_url(self, client: httpx.AsyncClient, url: str, spec_url: str) -> httpx.Response:
+        """Probe a URL with HEAD (GET if unsupported), conditionally for the spec so an unchanged one is a 304"""
+        etag = self._spec_etag.get(url) if url == spec_url else None
+        headers = {"If-None-Match": etag} if etag else None
+        response = None
+        if url not in self._head_unsupported:
+            response = await client.head(url, headers=headers, follow_redirects=True)
+            if response.status_code in (405, 501):
+                self._head_unsupported.add(url)
+                response = None
+        if response is None:
+            response = await client.get(url, headers=headers, follow_redirects=True)
+        if url == spec_url and response.status_code == 200:
+            self._remember_spec_etag(url, response)
+        return response
+    
     async def health_check_server(self, server: OpenAPIServer) -> bool:
         """Check if an OpenAPI server is healthy"""
         try:
-            async with httpx.AsyncClient(timeout=5.0, follow_redirects=True) as client:
-                # Try endpoints in order of reliability:
-                # 1. OpenAPI spec (most reliable)
-                # 2. Base URL 
-                # 3. Health endpoint (if it exists)
-                endpoints_to_try = [
-                    (server.openapi_url, "OpenAPI spec"),
-                    ("/", "base URL"),
-                ]
-                
-                # Only try health endpoint if we know it exists (not default /health)
-                if server.health_endpoint and server.health_endpoint != "/health":
-                    endpoints_to_try.append((server.health_endpoint, "health endpoint"))
-                
-                for endpoint, endpoint_type in endpoints_to_try:
+            client = self.http
+            # Try endpoints in order of reliability:
+            # 1. OpenAPI spec (most reliable)
+            # 2. Base URL 
+            # 3. Health endpoint (if it exists)
+            endpoints_to_try = [
+                (server.openapi_url, "OpenAPI spec"),
+                ("/", "base URL"),
+            ]
+            
+            # Only try health endpoint if we know it exists (not default /health)
+            if server.health_endpoint and server.health_endpoint != "/health":
+                endpoints_to_try.append((server.health_endpoint, "health endpoint"))
+            
+            urls = [
+                endpoint if endpoint.startswith('http') else f"{server.base_url.rstrip('/')}{endpoint}"
+                for endpoint, _ in endpoints_to_try
+            ]
+            
+            # Probe all endpoints at once; the first healthy response wins
+            probes = [
+                asyncio.create_task(asyncio.wait_for(self._probe_health_url(client, url, server.openapi_url), 5.0))
+                for url in urls
+            ]
+            try:
+                for probe in asyncio.as_completed(probes):
                     try:
-                        if endpoint.startswith('http'):
-                            url = endpoint  # Full URL for openapi_url
-                        else:
-                            url = f"{server.base_url.rstrip('/')}{endpoint}"
-                            
-                        response = await client.get(url)
-                        if response.status_code < 400:  # Accept 2xx and 3xx as healthy
-                            server.last_seen = datetime.now()
-                            server.status = "online"
-                            return True
+                        response = await probe
                     except Exception:
                         continue
-                        
-                server.status = "offline"
-                return False
-                
+                    if response.status_code < 400:  # Accept 2xx and 3xx (incl. 304 Not Modified) as healthy
+                        server.last_seen = datetime.now()
+                        self._set_server_status(server, _STATUS_ONLINE)
+                        return True
+            finally:
+                for probe in probes:
+                    probe.cancel()
+                    
+            self._set_server_status(server, _STATUS_OFFLINE)
+            return False
+            
         except Exception:
             # Don't log health check failures - they're too noisy
-            server.status = "error"
+            self._set_server_status(server, _STATUS_ERROR)
             return False
     
     def get_next_port(self) -> int:
@@ -252,26 +602,26 @@ class MCPBridgeRegistry:
             server.tags = request.tags
             
         # Generate bridge ID and configuration
+        server_id = server_id_for(server.base_url)
         bridge_id = f"bridge_{len(self.bridges) + 1}_{int(time.time())}"
         bridge_port = self.get_next_port()
-        bridge_url = f"http://localhost:{bridge_port}"
         
         bridge = MCPBridge(
             id=bridge_id,
             name=f"MCP Bridge for {server.name}",
-            openapi_server=server,
-            bridge_url=bridge_url,
+            server_id=server_id,
+            port=bridge_port,
             created_at=datetime.now(),
-            status="stopped"
+            status=_STATUS_STOPPED
         )
         
         # Store in registries
-        server_id = f"{server.name}_{hash(server.base_url) % 10000}"
-        self.servers[server_id] = server
-        self.bridges[bridge_id] = bridge
+        self.add_server(server_id, server)
+        self.add_bridge(bridge)
         
         # Save data
-        self.save_data()
+        self.mark_server_dirty(server_id)
+        self.mark_bridge_dirty(bridge_id)
         
         logger.info(f"Created bridge {bridge_id} for {server.name}")
         return bridge
@@ -283,15 +633,13 @@ class MCPBridgeRegistry:
             
         bridge = self.bridges[bridge_id]
         
-        if bridge.status == "running":
+        if bridge.status == _STATUS_RUNNING:
             return True
             
         try:
-            bridge.status = "starting"
+            self._set_bridge_status(bridge, _STATUS_STARTING)
             
-            # Extract port from bridge URL
-            parsed_url = urlparse(bridge.bridge_url)
-            port = parsed_url.port
+            port = bridge.port
             
             # Start the bridge process
             # Assuming the bridge script is in the bridge directory
@@ -299,32 +647,34 @@ class MCPBridgeRegistry:
             
             # Set environment variables for the bridge
             env = {
+                **self._base_env,
                 "OPENAPI_BASE_URL": bridge.openapi_server.base_url,
                 "OPENAPI_SPEC_URL": bridge.openapi_server.openapi_url,
                 "BRIDGE_PORT": str(port),
                 "BRIDGE_ID": bridge_id
             }
             
-            # Start bridge process (this is a simplified version)
-            process = subprocess.Popen(
-                ["node", str(bridge_script)],
-                env={**subprocess.os.environ, **env},
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+            # Start bridge process (this is a simplified version); fork/exec stays off the event loop
+            process = await asyncio.create_subprocess_exec(
+                "node", str(bridge_script),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
+            self._processes[bridge_id] = process
             bridge.process_id = process.pid
-            bridge.status = "running"
+            self._set_bridge_status(bridge, _STATUS_RUNNING)
             bridge.last_health_check = datetime.now()
             
-            self.save_data()
+            self.mark_bridge_dirty(bridge_id)
             
             logger.info(f"Started bridge {bridge_id} on port {port}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to start bridge {bridge_id}: {e}")
-            bridge.status = "error"
+            self._set_bridge_status(bridge, _STATUS_ERROR)
             return False
     
     async def stop_bridge(self, bridge_id: str) -> bool:
@@ -334,17 +684,31 @@ class MCPBridgeRegistry:
             
         bridge = self.bridges[bridge_id]
         
-        if bridge.status == "stopped":
+        if bridge.status == _STATUS_STOPPED:
             return True
             
         try:
-            if bridge.process_id:
-                # Kill the process
-                subprocess.run(["kill", str(bridge.process_id)], check=False)
+            process = self._processes.pop(bridge_id, None)
+            if process:
+                # Signal through the handle so a recycled PID can never be hit
+                try:
+                    process.terminate()
+                    await asyncio.wait_for(process.wait(), 3)
+                except ProcessLookupError:
+                    pass  # already exited
+                except asyncio.TimeoutError:
+                    process.kill()
+                bridge.process_id = None
+            elif bridge.process_id:
+                # Started before a restart; only the persisted PID is known
+                try:
+                    os.kill(bridge.process_id, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
                 bridge.process_id = None
                 
-            bridge.status = "stopped"
-            self.save_data()
+            self._set_bridge_status(bridge, _STATUS_STOPPED)
+            self.mark_bridge_dirty(bridge_id)
             
             logger.info(f"Stopped bridge {bridge_id}")
             return True
@@ -353,16 +717,54 @@ class MCPBridgeRegistry:
             logger.error(f"Failed to stop bridge {bridge_id}: {e}")
             return False
     
+    def add_server(self, server_id: str, server: OpenAPIServer):
+        """Register a server, updating the stats counters"""
+        previous = self.servers.get(server_id)
+        if previous is not None:
+            self._online_servers -= previous.status == _STATUS_ONLINE
+        self.servers[server_id] = server
+        self._online_servers += server.status == _STATUS_ONLINE
+        self._invalidate_server_responses()
+    
+    def add_bridge(self, bridge: MCPBridge):
+        """Register a bridge, updating the stats counters"""
+        previous = self.bridges.get(bridge.id)
+        if previous is not None:
+            self._running_bridges -= previous.status == _STATUS_RUNNING
+        self.bridges[bridge.id] = bridge
+        self._running_bridges += bridge.status == _STATUS_RUNNING
+        self._bridges_resp_cache = None
+    
+    def remove_bridge(self, bridge_id: str):
+        """Unregister a bridge, updating the stats counters"""
+        bridge = self.bridges.pop(bridge_id)
+        self._dirty_bridges.discard(bridge_id)
+        self._deleted_bridges.add(bridge_id)
+        self._running_bridges -= bridge.status == _STATUS_RUNNING
+        self._bridges_resp_cache = None
+    
+    def _set_server_status(self, server: OpenAPIServer, status: str):
+        """Change a server's status, updating the stats counters"""
+        # Health sweeps work on a snapshot, so the server may have been replaced meanwhile
+        if self.servers.get(server_id_for(server.base_url)) is server:
+            self._online_servers += (status == _STATUS_ONLINE) - (server.status == _STATUS_ONLINE)
+        server.status = status
+        self._invalidate_server_responses()
+    
+    def _set_bridge_status(self, bridge: MCPBridge, status: str):
+        """Change a bridge's status, updating the stats counters"""
+        if self.bridges.get(bridge.id) is bridge:
+            self._running_bridges += (status == _STATUS_RUNNING) - (bridge.status == _STATUS_RUNNING)
+        bridge.status = status
+        self._bridges_resp_cache = None
+    
     def get_stats(self) -> RegistryStats:
         """Get registry statistics"""
-        online_servers = sum(1 for s in self.servers.values() if s.status == "online")
-        running_bridges = sum(1 for b in self.bridges.values() if b.status == "running")
-        
         return RegistryStats(
             total_servers=len(self.servers),
-            online_servers=online_servers,
+            online_servers=self._online_servers,
             total_bridges=len(self.bridges),
-            running_bridges=running_bridges,
+            running_bridges=self._running_bridges,
             registry_uptime=time.time() - self.start_time
         )
 
@@ -373,7 +775,8 @@ registry = MCPBridgeRegistry()
 app = FastAPI(
     title="MCP Bridge Registry",
     description="Central registry for OpenAPI to MCP bridges",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -402,12 +805,13 @@ async def get_stats() -> RegistryStats:
 @app.get("/servers")
 async def list_servers():
     """List all registered OpenAPI servers"""
-    return {"servers": [asdict(server) for server in registry.servers.values()]}
+    # The body is cached pre-rendered between changes, skipping jsonable_encoder and re-serialization
+    return Response(registry.render_servers(), media_type="application/json")
 
 @app.get("/bridges")
 async def list_bridges():
     """List all MCP bridges"""
-    return {"bridges": [asdict(bridge) for bridge in registry.bridges.values()]}
+    return Response(registry.render_bridges(), media_type="application/json")
 
 @app.post("/bridges")
 async def create_bridge(request: BridgeRequest, background_tasks: BackgroundTasks):
@@ -418,7 +822,7 @@ async def create_bridge(request: BridgeRequest, background_tasks: BackgroundTask
         # Optionally auto-start the bridge
         background_tasks.add_task(registry.start_bridge, bridge.id)
         
-        return {"bridge": asdict(bridge), "message": "Bridge created successfully"}
+        return {"bridge": bridge.as_response_dict(), "message": "Bridge created successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -453,7 +857,7 @@ async def get_bridge(bridge_id: str):
         raise HTTPException(status_code=404, detail="Bridge not found")
     
     bridge = registry.bridges[bridge_id]
-    return {"bridge": asdict(bridge)}
+    return {"bridge": bridge.as_response_dict()}
 
 @app.delete("/bridges/{bridge_id}")
 async def delete_bridge(bridge_id: str):
@@ -465,21 +869,21 @@ async def delete_bridge(bridge_id: str):
     await registry.stop_bridge(bridge_id)
     
     # Remove from registry
-    del registry.bridges[bridge_id]
-    registry.save_data()
+    registry.remove_bridge(bridge_id)
+    registry._flush_now()
     
     return {"message": f"Bridge {bridge_id} deleted successfully"}
 
 @app.post("/discover")
-async def discover_server(base_url: str):
-    """Discover an OpenAPI server at the given base URL"""
+async def discover_server(base_url: str, force: bool = False):
+    """Discover an OpenAPI server at the given base URL (force=true bypasses the discovery cache)"""
     try:
-        server = await registry.discover_openapi_server(base_url)
+        server = await registry.discover_openapi_server(base_url, force=force)
         if server:
-            server_id = f"{server.name}_{hash(server.base_url) % 10000}"
-            registry.servers[server_id] = server
-            registry.save_data()
-            return {"server": asdict(server), "message": "Server discovered and registered"}
+            server_id = server_id_for(server.base_url)
+            registry.add_server(server_id, server)
+            registry.mark_server_dirty(server_id)
+            return {"server": server.as_dict(), "message": "Server discovered and registered"}
         else:
             raise HTTPException(status_code=404, detail="No OpenAPI server found at the given URL")
     except Exception as e:
@@ -488,11 +892,21 @@ async def discover_server(base_url: str):
 # Background task for health checking
 async def health_check_task():
     """Background task to periodically health check all servers"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_HEALTH_CHECKS)
+    
+    async def guarded(server_id: str, server: OpenAPIServer) -> str:
+        async with semaphore:
+            try:
+                await registry.health_check_server(server)
+            except Exception:
+                pass
+        return server_id
+    
     while True:
         try:
-            for server in registry.servers.values():
-                await registry.health_check_server(server)
-            registry.save_data()
+            # Check servers concurrently, bounded; snapshot the items since requests can add servers meanwhile
+            for check in asyncio.as_completed([guarded(k, s) for k, s in list(registry.servers.items())]):
+                registry.mark_server_dirty(await check)
             await asyncio.sleep(60)  # Check every minute
         except Exception as e:
             logger.error(f"Health check task error: {e}")
@@ -501,10 +915,30 @@ async def health_check_task():
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on startup"""
-    # Start health checking task
+    # Pooled keep-alive client shared by all discovery and health probes; only health
+    # probes follow redirects, so discovery registers servers under the URL it was given
+    registry.http = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(5.0, connect=2.0),
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=60)
+    )
+    
+    # Start health checking and persistence tasks
     asyncio.create_task(health_check_task())
+    registry._flush_task = asyncio.create_task(registry._flush_loop())
     logger.info("MCP Bridge Registry started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending changes and close the shared HTTP client"""
+    if registry._flush_task:
+        registry._flush_task.cancel()
+    if registry._dirty:
+        registry._flush_now()
+    registry._db.close()
+    if registry.http:
+        await registry.http.aclose()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
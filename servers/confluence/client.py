@@ -1,82 +1,224 @@
+import asyncio
 import httpx
 import base64
-from typing import Optional, Dict, Any, List
-from urllib.parse import urljoin
+import functools
+import ijson
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+from urllib.parse import urlsplit
 import logging
+import os
+import random
+import time
 from models import (
     CreatePageRequest, UpdatePageRequest, PageResponse, 
     ConfluenceError, AuthConfig, SpaceInfo, PageListResponse,
-    CreateSpaceRequest
+    CreateSpaceRequest, PageBody, Version, BodyRepresentation, PageStatus
 )
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 logger = logging.getLogger(__name__)
 
+# How long the space listing backing get_space_by_key is trusted before refetching
+SPACE_CACHE_TTL = 300
+
+# Page listings larger than this are decoded and parsed off the event loop
+LARGE_RESPONSE_BYTES = 256 * 1024
+
+# Sent with requests whose body is pre-encoded JSON
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Body representations in the order _parse_page_response prefers them
+_BODY_REPR_TYPES = ("storage", "atlas_doc_format", "wiki", "view")
+
+
+class _AsyncResponseReader:
+    """Async file-like adapter over a streamed httpx response, for ijson"""
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk for it
+        if size == 0:
+            return b""
+        # ijson treats b"" as EOF, so skip any empty chunks the stream yields
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+class _RetryTransport(httpx.AsyncBaseTransport):
+    """Retries throttled or transiently failing requests with jittered exponential backoff"""
+    
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+    # Only a 429 guarantees the request wasn't processed, so gateway errors are retried for these only
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        max_retries: int = 5,
+        max_delay: float = 30.0,
+        max_concurrency: int = 32
+    ):
+        self._transport = transport
+        self._max_retries = max_retries
+        self._max_delay = max_delay
+        # Caps requests in flight to Atlassian across every client sharing this transport;
+        # held per attempt, not across backoff sleeps
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+    
+    def _should_retry(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        return response.status_code in self.RETRY_STATUSES and request.method in self.IDEMPOTENT_METHODS
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        try:
+            retry_after = float(response.headers.get("Retry-After", 0))
+        except ValueError:  # HTTP-date form; fall back to backoff
+            retry_after = 0
+        return min(retry_after or 2 ** attempt, self._max_delay) + random.uniform(0, 0.5)
+    
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        async with self._semaphore:
+            return await self._transport.handle_async_request(request)
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self._max_retries):
+            response = await self._send(request)
+            if not self._should_retry(request, response):
+                return response
+            delay = self._retry_delay(response, attempt)
+            logger.warning(
+                "Confluence returned %d for %s %s, retrying in %.1fs",
+                response.status_code, request.method, request.url.path, delay
+            )
+            await response.aclose()
+            await asyncio.sleep(delay)
+        return await self._send(request)
+    
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def build_transport() -> httpx.AsyncBaseTransport:
+    """Pooled HTTP/2 transport for Confluence clients; share one to reuse connections across clients"""
+    # Pool limits and HTTP/2 live on the transport, which also retries failed connects;
+    # the wrapper retries rate-limited and transient gateway failures.
+    return _RetryTransport(
+        httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+            retries=2
+        ),
+        max_concurrency=int(os.getenv("CONFLUENCE_CONCURRENCY", "32"))
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _basic_auth_header(email: str, token: str) -> str:
+    """Encode Basic Auth credentials, reused across clients for the same account"""
+    return "Basic " + base64.b64encode(f"{email}:{token}".encode()).decode()
+
 
 class ConfluenceAPIClient:
     """Confluence Cloud REST API v2 client with authentication"""
     
-    def __init__(self, auth_config: AuthConfig):
+    def __init__(self, auth_config: AuthConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = auth_config.base_url.rstrip('/')
         self.email = auth_config.email
         self.api_token = auth_config.api_token
         
-        # Create basic auth header
-        credentials = f"{self.email}:{self.api_token}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        
-        self.headers = {
-            "Authorization": f"Basic {encoded_credentials}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
+        # Read-only so the same headers can't be mutated after the client copies them.
+        # Content-Type is sent only with JSON bodies (see _JSON_HEADERS), not on every GET.
+        self.headers = MappingProxyType({
+            "Authorization": _basic_auth_header(self.email, self.api_token),
+            "Accept": "application/json"
+        })
+        
+        # API v2 base URL. API paths and _links are host-absolute, so they're joined
+        # to the origin by concatenation rather than urljoin
+        parts = urlsplit(self.base_url)
+        self._origin = f"{parts.scheme}://{parts.netloc}"
+        self.api_base = f"{self._origin}/wiki/api/v2"
+        
+        # Endpoint URLs, built once rather than per call
+        self._url_spaces = f"{self.api_base}/spaces"
+        self._url_pages = f"{self.api_base}/pages"
+        self._url_page = f"{self.api_base}/pages/{{}}"
+        self._url_space_pages = f"{self.api_base}/spaces/{{}}/pages"
+        
+        # Async client so bulk operations can overlap requests. The connection pool lives in the
+        # transport; a caller-supplied one is shared with other clients and closed by its owner.
+        self._owns_transport = transport is None
+        self.client = httpx.AsyncClient(
+            headers=httpx.Headers(self.headers),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            follow_redirects=True,
+            transport=transport or build_transport()
+        )
         
-        # API v2 base URL
-        self.api_base = urljoin(self.base_url, "/wiki/api/v2")
+        # (fetched_at, space) keyed on lowercased space key, trusted for SPACE_CACHE_TTL seconds
+        self._space_by_key_lower: Dict[str, Tuple[float, SpaceInfo]] = {}
         
-        # HTTP client with timeouts
-        self.client = httpx.Client(
-            headers=self.headers,
-            timeout=30.0,
-            follow_redirects=True
-        )
+        # In-flight get_page fetches keyed on (page_id, include_body)
+        self._inflight_pages: Dict[Tuple[str, bool], asyncio.Future] = {}
     
-    def __enter__(self):
+    async def __aenter__(self):
         return self
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.client.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the HTTP client, unless its transport is shared"""
+        if self._owns_transport:
+            await self.client.aclose()
     
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         """Handle API response and errors"""
-        try:
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            error_data = {}
+        # Check the status directly rather than building an HTTPStatusError just to catch it
+        if response.status_code < 400:
             try:
-                error_data = response.json()
-            except:
-                error_data = {"message": response.text or "Unknown error"}
-            
-            logger.error(f"Confluence API error {response.status_code}: {error_data}")
-            raise ConfluenceError(
-                message=error_data.get("message", f"HTTP {response.status_code} error"),
-                status_code=response.status_code,
-                details=error_data
-            )
-        except Exception as e:
-            logger.error(f"Request failed: {e}")
-            raise ConfluenceError(
-                message=f"Request failed: {str(e)}",
-                status_code=500,
-                details={"original_error": str(e)}
-            )
+                return _json_loads(response.content)
+            except ValueError as e:
+                logger.error("Request failed: %s", e)
+                raise ConfluenceError(
+                    message=f"Request failed: {str(e)}",
+                    status_code=500,
+                    details={"original_error": str(e)}
+                )
+        
+        try:
+            error_data = _json_loads(response.content)
+        except ValueError:
+            error_data = {"message": response.text or "Unknown error"}
+        
+        logger.error("Confluence API error %d: %s", response.status_code, error_data)
+        raise ConfluenceError(
+            message=error_data.get("message", f"HTTP {response.status_code} error"),
+            status_code=response.status_code,
+            details=error_data
+        )
     
-    def test_connection(self) -> Dict[str, Any]:
+    async def test_connection(self) -> Dict[str, Any]:
         """Test the API connection and authentication"""
         try:
-            url = f"{self.api_base}/spaces"
-            response = self.client.get(url, params={"limit": 1})
+            url = self._url_spaces
+            response = await self.client.get(url, params={"limit": 1})
             data = self._handle_response(response)
             return {
                 "success": True,
@@ -91,32 +233,48 @@ class ConfluenceAPIClient:
                 "status_code": e.status_code
             }
     
-    def get_spaces(self, limit: int = 25) -> List[SpaceInfo]:
+    async def get_spaces(self, limit: int = 25) -> List[SpaceInfo]:
         """Get list of spaces"""
-        url = f"{self.api_base}/spaces"
-        response = self.client.get(url, params={"limit": limit})
+        url = self._url_spaces
+        response = await self.client.get(url, params={"limit": limit})
         data = self._handle_response(response)
         
-        spaces = []
-        for space_data in data.get("results", []):
-            spaces.append(SpaceInfo(
-                id=str(space_data["id"]),
-                key=space_data["key"],
-                name=space_data["name"],
-                type=space_data.get("type", "unknown"),
-                status=space_data.get("status", "unknown")
-            ))
-        return spaces
-    
-    def get_space_by_key(self, space_key: str) -> Optional[SpaceInfo]:
+        return [self._parse_space(space_data) for space_data in data.get("results", [])]
+    
+    async def get_space_by_key(self, space_key: str) -> Optional[SpaceInfo]:
         """Get space information by key"""
-        spaces = self.get_spaces(limit=250)  # Get more spaces to search
-        for space in spaces:
-            if space.key.lower() == space_key.lower():
-                return space
-        return None
+        key_lower = space_key.lower()
+        cached = self._space_by_key_lower.get(key_lower)
+        if cached and time.monotonic() - cached[0] < SPACE_CACHE_TTL:
+            return cached[1]
+        # Drop an expired entry so a space deleted upstream isn't found again by the listing walk below
+        self._space_by_key_lower.pop(key_lower, None)
+        
+        # Ask for the key (as given and uppercased) directly; one small response instead of a full listing
+        keys = list(dict.fromkeys((space_key, space_key.upper())))
+        response = await self.client.get(self._url_spaces, params={"keys": keys})
+        data = self._handle_response(response)
+        for space_data in data.get("results", []):
+            self._cache_space(self._parse_space(space_data))
+        
+        # Keys are matched case-insensitively, so walk the listing when the exact-key lookup misses
+        url, params = self._url_spaces, {"limit": 250}
+        while key_lower not in self._space_by_key_lower and url:
+            response = await self.client.get(url, params=params)
+            data = self._handle_response(response)
+            for space_data in data.get("results", []):
+                self._cache_space(self._parse_space(space_data))
+            next_link = data.get("_links", {}).get("next")
+            url, params = (f"{self._origin}{next_link}", None) if next_link else (None, None)
+        
+        cached = self._space_by_key_lower.get(key_lower)
+        return cached[1] if cached and time.monotonic() - cached[0] < SPACE_CACHE_TTL else None
+    
+    def _cache_space(self, space: SpaceInfo):
+        """Remember a space for get_space_by_key"""
+        self._space_by_key_lower[space.key.lower()] = (time.monotonic(), space)
     
-    def create_space(self, request: CreateSpaceRequest) -> SpaceInfo:
+    async def create_space(self, request: CreateSpaceRequest) -> SpaceInfo:
         """Create a new space in Confluence"""
         body_data = {
             "key": request.key.upper(),  # Space keys should be uppercase
@@ -130,21 +288,23 @@ class ConfluenceAPIClient:
                 "value": request.description
             }
         
-        logger.info(f"Creating space with data: {body_data}")
+        logger.info("Creating space with data: %s", body_data)
         
-        url = f"{self.api_base}/spaces"
-        response = self.client.post(url, json=body_data)
+        url = self._url_spaces
+        response = await self.client.post(url, content=_json_dumps(body_data), headers=_JSON_HEADERS)
         data = self._handle_response(response)
         
-        return SpaceInfo(
+        space = SpaceInfo.model_construct(
             id=str(data["id"]),
             key=data["key"],
             name=data["name"],
             type=data.get("type", "global"),
             status=data.get("status", "current")
         )
+        self._cache_space(space)
+        return space
     
-    def create_page(
+    async def create_page(
         self, 
         request: CreatePageRequest,
         embedded: bool = False,
@@ -152,7 +312,11 @@ class ConfluenceAPIClient:
         root_level: bool = False
     ) -> PageResponse:
         """Create a new page in Confluence"""
-        
+        payload = self._build_create_page_payload(request, root_level=root_level)
+        return await self._post_page(payload, self._create_page_params(embedded, private, root_level))
+    
+    def _build_create_page_payload(self, request: CreatePageRequest, root_level: bool = False) -> bytes:
+        """Validate a create request and encode its JSON body"""
         # Validate required fields for published pages
         if request.status == "current" and not request.title:
             raise ConfluenceError(
@@ -160,15 +324,6 @@ class ConfluenceAPIClient:
                 status_code=400
             )
         
-        # Build query parameters
-        params = {}
-        if embedded:
-            params["embedded"] = "true"
-        if private:
-            params["private"] = "true"
-        if root_level:
-            params["root-level"] = "true"
-        
         # Prepare request body
         body_data = {
             "spaceId": request.spaceId,
@@ -187,27 +342,53 @@ class ConfluenceAPIClient:
                 "value": request.body.value
             }
         
-        logger.info(f"Creating page with data: {body_data}")
-        
-        url = f"{self.api_base}/pages"
-        response = self.client.post(url, json=body_data, params=params)
+        logger.info("Creating page with data: %s", body_data)
+        return _json_dumps(body_data)
+    
+    @staticmethod
+    def _create_page_params(embedded: bool, private: bool, root_level: bool) -> Dict[str, str]:
+        """Build query parameters for page creation"""
+        params = {}
+        if embedded:
+            params["embedded"] = "true"
+        if private:
+            params["private"] = "true"
+        if root_level:
+            params["root-level"] = "true"
+        return params
+    
+    async def _post_page(self, payload: bytes, params: Dict[str, str]) -> PageResponse:
+        """POST an encoded page body"""
+        url = self._url_pages
+        response = await self.client.post(url, content=payload, headers=_JSON_HEADERS, params=params)
         data = self._handle_response(response)
         
         return self._parse_page_response(data)
     
-    def get_page(self, page_id: str, include_body: bool = True) -> PageResponse:
-        """Get a page by ID"""
-        url = f"{self.api_base}/pages/{page_id}"
+    async def get_page(self, page_id: str, include_body: bool = True) -> PageResponse:
+        """Get a page by ID, sharing one request between concurrent callers for the same page"""
+        key = (str(page_id), include_body)
+        task = self._inflight_pages.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_page(page_id, include_body))
+            self._inflight_pages[key] = task
+            task.add_done_callback(lambda _: self._inflight_pages.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_page(self, page_id: str, include_body: bool) -> PageResponse:
+        """Fetch a page by ID"""
+        url = self._url_page.format(page_id)
         params = {}
         if include_body:
             params["body-format"] = "storage"
         
-        response = self.client.get(url, params=params)
+        response = await self.client.get(url, params=params)
         data = self._handle_response(response)
         
         return self._parse_page_response(data)
     
-    def update_page(self, request: UpdatePageRequest) -> PageResponse:
+    async def update_page(self, request: UpdatePageRequest) -> PageResponse:
         """Update an existing page"""
         body_data = {
             "version": {
@@ -230,81 +411,124 @@ class ConfluenceAPIClient:
         if request.version.message:
             body_data["version"]["message"] = request.version.message
         
-        url = f"{self.api_base}/pages/{request.id}"
-        response = self.client.put(url, json=body_data)
+        url = self._url_page.format(request.id)
+        response = await self.client.put(url, content=_json_dumps(body_data), headers=_JSON_HEADERS)
         data = self._handle_response(response)
         
         return self._parse_page_response(data)
     
-    def delete_page(self, page_id: str, purge: bool = False) -> bool:
+    async def delete_page(self, page_id: str, purge: bool = False) -> bool:
         """Delete a page"""
-        url = f"{self.api_base}/pages/{page_id}"
+        url = self._url_page.format(page_id)
         params = {}
         if purge:
             params["purge"] = "true"
         
-        response = self.client.delete(url, params=params)
+        response = await self.client.delete(url, params=params)
         try:
             self._handle_response(response)
             return True
         except ConfluenceError:
             return False
     
-    def get_pages_in_space(
+    async def get_pages_bulk(self, ids: List[str], include_body: bool = True) -> List[PageResponse]:
+        """Get several pages by ID concurrently"""
+        return await asyncio.gather(*(self.get_page(i, include_body=include_body) for i in ids))
+    
+    async def create_pages_bulk(
+        self,
+        requests: List[CreatePageRequest],
+        embedded: bool = False,
+        private: bool = False,
+        root_level: bool = False
+    ) -> List[PageResponse]:
+        """Create several pages concurrently"""
+        # Encode every body up front so an invalid request fails before anything is created
+        payloads = [self._build_create_page_payload(r, root_level=root_level) for r in requests]
+        params = self._create_page_params(embedded, private, root_level)
+        return await asyncio.gather(*(self._post_page(payload, params) for payload in payloads))
+    
+    async def get_pages_in_space(
         self, 
         space_id: str, 
         limit: int = 25,
         include_body: bool = False
     ) -> PageListResponse:
         """Get pages in a space"""
-        url = f"{self.api_base}/spaces/{space_id}/pages"
+        url = self._url_space_pages.format(space_id)
         params = {"limit": limit}
         if include_body:
             params["body-format"] = "storage"
         
-        response = self.client.get(url, params=params)
+        response = await self.client.get(url, params=params)
+        # Storage bodies can make this a multi-MB parse; keep it from stalling other requests
+        if len(response.content) > LARGE_RESPONSE_BYTES:
+            return await asyncio.to_thread(self._parse_page_list, response)
+        return self._parse_page_list(response)
+    
+    def _parse_page_list(self, response: httpx.Response) -> PageListResponse:
+        """Parse a page listing response"""
         data = self._handle_response(response)
         
         pages = []
         for page_data in data.get("results", []):
             pages.append(self._parse_page_response(page_data))
         
-        return PageListResponse(
+        return PageListResponse.model_construct(
             results=pages,
             links=data.get("_links")
         )
     
+    async def get_pages_in_space_iter(
+        self,
+        space_id: str,
+        limit: int = 25,
+        include_body: bool = False
+    ) -> AsyncIterator[PageResponse]:
+        """Stream pages in a space, parsing one result at a time instead of buffering the listing"""
+        url = self._url_space_pages.format(space_id)
+        params = {"limit": limit}
+        if include_body:
+            params["body-format"] = "storage"
+        
+        async with self.client.stream("GET", url, params=params) as response:
+            if response.is_error:
+                await response.aread()
+                self._handle_response(response)
+            async for page_data in ijson.items(_AsyncResponseReader(response), "results.item"):
+                yield self._parse_page_response(page_data)
+    
+    def _parse_space(self, space_data: Dict[str, Any]) -> SpaceInfo:
+        """Parse space data from API response"""
+        return SpaceInfo.model_construct(
+            id=str(space_data["id"]),
+            key=space_data["key"],
+            name=space_data["name"],
+            type=space_data.get("type", "unknown"),
+            status=space_data.get("status", "unknown")
+        )
+    
     def _parse_page_response(self, data: Dict[str, Any]) -> PageResponse:
         """Parse page data from API response"""
-        from models import PageBody, Version, BodyRepresentation, PageStatus
-        
         # Parse body if present
         body = None
-        if "body" in data and data["body"]:
-            body_data = data["body"]
-            if isinstance(body_data, dict) and "storage" in body_data:
-                body = PageBody(
-                    representation=BodyRepresentation.storage,
-                    value=body_data["storage"]["value"]
+        body_data = data.get("body")
+        if body_data and isinstance(body_data, dict):
+            repr_type = next((r for r in _BODY_REPR_TYPES if r in body_data), None)
+            if repr_type:
+                body = PageBody.model_construct(
+                    representation=BodyRepresentation(repr_type),
+                    value=body_data[repr_type].get("value", "")
                 )
-            elif isinstance(body_data, dict):
-                # Handle other body formats
-                for repr_type in ["storage", "atlas_doc_format", "wiki", "view"]:
-                    if repr_type in body_data:
-                        body = PageBody(
-                            representation=repr_type,
-                            value=body_data[repr_type].get("value", "")
-                        )
-                        break
         
         # Parse version
         version_data = data.get("version", {"number": 1})
-        version = Version(
+        version = Version.model_construct(
             number=version_data.get("number", 1),
             message=version_data.get("message")
         )
         
-        return PageResponse(
+        return PageResponse.model_construct(
             id=str(data["id"]),
             status=PageStatus(data.get("status", "current")),
             title=data.get("title", ""),
@@ -319,19 +543,17 @@ class ConfluenceAPIClient:
     
     def _parse_rest_api_page_response(self, data: Dict[str, Any]) -> PageResponse:
         """Parse page data from REST API v1 response"""
-        from models import PageBody, Version, BodyRepresentation, PageStatus
-        
         # Parse body if present
         body = None
         if "body" in data and "storage" in data["body"]:
-            body = PageBody(
+            body = PageBody.model_construct(
                 representation=BodyRepresentation.storage,
                 value=data["body"]["storage"]["value"]
             )
         
         # Parse version
         version_data = data.get("version", {"number": 1})
-        version = Version(
+        version = Version.model_construct(
             number=version_data.get("number", 1),
             message=version_data.get("message")
         )
@@ -341,7 +563,7 @@ class ConfluenceAPIClient:
         if "space" in data:
             space_id = str(data["space"].get("id", ""))
         
-        return PageResponse(
+        return PageResponse.model_construct(
             id=str(data["id"]),
             status=PageStatus(data.get("status", "current")),
             title=data.get("title", ""),
@@ -17,12 +17,14 @@ Features:
 - OpenAPI/Swagger documentation
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
-from typing import Optional, List
+import httpx
+import orjson
+from typing import Optional, List, Union
 import os
 from functools import lru_cache
 from dotenv import load_dotenv
@@ -34,7 +36,7 @@ from models import (
     CreatePageRequest, UpdatePageRequest, PageResponse, AuthConfig,
     ConfluenceError, SpaceInfo, PageListResponse, CreateSpaceRequest
 )
-from client import ConfluenceAPIClient
+from client import ConfluenceAPIClient, build_transport
 
 # Configure logging
 logging.basicConfig(
@@ -46,16 +48,25 @@ logger = logging.getLogger(__name__)
 # Global client instance
 _confluence_client: Optional[ConfluenceAPIClient] = None
 
+# Connection pool shared by every client instance, so /configure doesn't drop warm connections
+_http_transport: Optional[httpx.AsyncBaseTransport] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
+    global _confluence_client, _http_transport
     logger.info("Starting Confluence API Tool Server")
+    _http_transport = build_transport()
+    # Every route is registered by now; build the schema once and keep it pre-serialized
+    schema = app.openapi()
+    app.openapi = lambda: schema
+    app.state.openapi_bytes = orjson.dumps(schema)
     yield
     logger.info("Shutting down Confluence API Tool Server")
-    global _confluence_client
     if _confluence_client:
-        _confluence_client.client.close()
+        await _confluence_client.aclose()
+    await _http_transport.aclose()
 
 
 app = FastAPI(
@@ -106,6 +117,10 @@ This server requires Confluence Cloud API authentication. You need:
     lifespan=lifespan,
 )
 
+# Drop FastAPI's built-in schema route, which re-serializes the schema on every request;
+# /openapi.json is served from the bytes cached in lifespan instead (/docs still points at it)
+app.router.routes = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -140,7 +155,7 @@ def get_confluence_client() -> ConfluenceAPIClient:
                 email=settings["confluence_email"],
                 api_token=settings["confluence_api_token"]
             )
-            _confluence_client = ConfluenceAPIClient(auth_config)
+            _confluence_client = ConfluenceAPIClient(auth_config, transport=_http_transport)
             logger.info("Initialized Confluence client from environment variables")
         else:
             raise HTTPException(
@@ -151,6 +166,13 @@ def get_confluence_client() -> ConfluenceAPIClient:
     return _confluence_client
 
 
+def _page_response(model: Union[PageResponse, PageListResponse]) -> Response:
+    """Serialize a page model built from Confluence data"""
+    # Returning a Response skips FastAPI's response_model revalidation; the route's
+    # response_model still documents the schema
+    return Response(orjson.dumps(model.model_dump(by_alias=True)), media_type="application/json")
+
+
 @app.exception_handler(ConfluenceError)
 async def confluence_error_handler(request, exc: ConfluenceError):
     """Handle Confluence API errors"""
@@ -164,6 +186,12 @@ async def confluence_error_handler(request, exc: ConfluenceError):
     )
 
 
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_schema():
+    """Serve the OpenAPI schema serialized at startup"""
+    return Response(app.state.openapi_bytes, media_type="application/json")
+
+
 @app.get("/", tags=["Health"])
 async def root():
     """Root endpoint with basic information"""
@@ -189,10 +217,10 @@ async def configure_authentication(auth_config: AuthConfig):
     
     try:
         # Create new client instance
-        _confluence_client = ConfluenceAPIClient(auth_config)
+        _confluence_client = ConfluenceAPIClient(auth_config, transport=_http_transport)
         
         # Test the connection
-        test_result = _confluence_client.test_connection()
+        test_result = await _confluence_client.test_connection()
         
         if test_result["success"]:
             logger.info(f"Successfully configured Confluence API for {auth_config.base_url}")
@@ -221,7 +249,7 @@ async def configure_authentication(auth_config: AuthConfig):
 @app.get("/test-connection", tags=["Configuration"])
 async def test_connection(client: ConfluenceAPIClient = Depends(get_confluence_client)):
     """Test the Confluence API connection"""
-    return client.test_connection()
+    return await client.test_connection()
 
 
 @app.get("/spaces", response_model=List[SpaceInfo], tags=["Spaces"])
@@ -230,7 +258,7 @@ async def list_spaces(
     client: ConfluenceAPIClient = Depends(get_confluence_client)
 ):
     """List available Confluence spaces"""
-    return client.get_spaces(limit=limit)
+    return await client.get_spaces(limit=limit)
 
 
 @app.post("/spaces", response_model=SpaceInfo, tags=["Spaces"])
@@ -244,7 +272,7 @@ async def create_space(
     - **name**: Space name
     - **description**: Optional space description
     """
-    return client.create_space(request)
+    return await client.create_space(request)
 
 
 @app.get("/spaces/{space_key}", response_model=Optional[SpaceInfo], tags=["Spaces"])
@@ -253,7 +281,7 @@ async def get_space_by_key(
     client: ConfluenceAPIClient = Depends(get_confluence_client)
 ):
     """Get space information by space key"""
-    space = client.get_space_by_key(space_key)
+    space = await client.get_space_by_key(space_key)
     if not space:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -270,7 +298,7 @@ async def list_pages_in_space(
     client: ConfluenceAPIClient = Depends(get_confluence_client)
 ):
     """List pages in a specific space"""
-    return client.get_pages_in_space(space_id, limit=limit, include_body=include_body)
+    return _page_response(await client.get_pages_in_space(space_id, limit=limit, include_body=include_body))
 
 
 @app.post("/pages", response_model=PageResponse, tags=["Pages"])
@@ -292,12 +320,12 @@ async def create_page(
     - **private**: Make page private (only creator can view/edit)
     - **root_level**: Create at space root level (ignores parentId)
     """
-    return client.create_page(
+    return _page_response(await client.create_page(
         request, 
         embedded=embedded, 
         private=private, 
         root_level=root_level
-    )
+    ))
 
 
 @app.get("/pages/{page_id}", response_model=PageResponse, tags=["Pages"])
@@ -307,7 +335,7 @@ async def get_page(
     client: ConfluenceAPIClient = Depends(get_confluence_client)
 ):
     """Get a page by ID"""
-    return client.get_page(page_id, include_body=include_body)
+    return _page_response(await client.get_page(page_id, include_body=include_body))
 
 
 @app.put("/pages/{page_id}", response_model=PageResponse, tags=["Pages"])
@@ -322,7 +350,7 @@ async def update_page(
     Use GET /pages/{page_id} to get the current version number first.
     """
     request.id = int(page_id)
-    return client.update_page(request)
+    return _page_response(await client.update_page(request))
 
 
 @app.delete("/pages/{page_id}", tags=["Pages"])
@@ -335,7 +363,7 @@ async def delete_page(
     
     - **purge**: If True, permanently delete the page. If False, move to trash.
     """
-    success = client.delete_page(page_id, purge=purge)
+    success = await client.delete_page(page_id, purge=purge)
     if success:
         return {"message": f"Page {page_id} {'purged' if purge else 'deleted'} successfully"}
     else:
@@ -347,11 +375,17 @@ async def delete_page(
 
 if __name__ == "__main__":
     import uvicorn
+    # Each worker process has its own client, so /configure only reaches the worker that served it;
+    # configure through environment variables when running more than one
+    reload = os.getenv("UVICORN_RELOAD", "true").lower() in ("1", "true", "yes")
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=reload,
+        workers=1 if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
     )
 
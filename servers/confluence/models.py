@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any, Union
 from enum import Enum
 from datetime import datetime
@@ -68,19 +68,18 @@ class CreatePageRequest(BaseModel):
         description="The body content of the page"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "spaceId": 123456,
-                "status": "current",
-                "title": "My New Page",
-                "parentId": 789012,
-                "body": {
-                    "representation": "storage",
-                    "value": "<p>This is the content of my new page.</p>"
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "spaceId": 123456,
+            "status": "current",
+            "title": "My New Page",
+            "parentId": 789012,
+            "body": {
+                "representation": "storage",
+                "value": "<p>This is the content of my new page.</p>"
             }
         }
+    })
 
 
 class UpdatePageRequest(BaseModel):
@@ -123,14 +122,13 @@ class AuthConfig(BaseModel):
     email: str = Field(description="User email address")
     api_token: str = Field(description="API token")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "base_url": "https://your-domain.atlassian.net",
-                "email": "your-email@example.com",
-                "api_token": "your-api-token"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "base_url": "https://your-domain.atlassian.net",
+            "email": "your-email@example.com",
+            "api_token": "your-api-token"
         }
+    })
 
 
 class PageListResponse(BaseModel):
@@ -159,12 +157,11 @@ class CreateSpaceRequest(BaseModel):
         description="The space description"
     )
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "key": "SYSTEMS",
-                "name": "Systems",
-                "description": "A space for system documentation and processes"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "key": "SYSTEMS",
+            "name": "Systems",
+            "description": "A space for system documentation and processes"
         }
+    })
 
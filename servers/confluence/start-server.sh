@@ -16,5 +16,5 @@ if command -v pyenv >/dev/null 2>&1; then
 fi
 
 # Start the server
-exec uvicorn main:app --host 0.0.0.0 --port 8001 --workers 1
+exec uvicorn main:app --host 0.0.0.0 --port 8001 --workers 1 --loop uvloop --http httptools
 
@@ -1,7 +1,15 @@
+import asyncio
+import concurrent.futures
+import hashlib
 import os
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, Field
-from typing import List
+from collections import OrderedDict
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from typing import Annotated, Dict, List, Tuple
+
+import faiss
+import msgspec
+import numpy as np
+import torch
 
 # --- RAG Libraries ---
 from langchain_community.vectorstores import FAISS
@@ -15,64 +23,184 @@ app = FastAPI(
 )
 
 
-class RetrievalQueryInput(BaseModel):
-    queries: List[str] = Field(
-        ..., description="List of queries to retrieve from the vectorstore"
-    )
-    k: int = Field(3, description="Number of results per query", example=3)
+# msgspec Structs rather than Pydantic models: decoding and encoding these is the per-request hot path
+class RetrievalQueryInput(msgspec.Struct):
+    queries: Annotated[List[str], msgspec.Meta(description="List of queries to retrieve from the vectorstore")]
+    k: Annotated[int, msgspec.Meta(description="Number of results per query", examples=[3])] = 3
 
 
-class RetrievedDoc(BaseModel):
+class RetrievedDoc(msgspec.Struct):
     query: str
     results: List[str]
 
 
-class RetrievalResponse(BaseModel):
+class RetrievalResponse(msgspec.Struct):
     responses: List[RetrievedDoc]
 
 
+# FastAPI can't introspect Structs, so their schemas are added to the OpenAPI document by hand
+_, _SCHEMA_COMPONENTS = msgspec.json.schema_components(
+    (RetrievalQueryInput, RetrievalResponse), ref_template="#/components/schemas/{name}"
+)
+
+
+def openapi():
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_SCHEMA_COMPONENTS)
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
+
 # --------- Initialize Retriever (on app startup) --------
 VECTORSTORE_PATH = "faiss_index"  # Path to your FAISS vector store
 EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"  # Widely used, fast
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))  # IVF lists scanned per query (see quantize_index.py)
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+# "onnx" runs an int8-quantized export on CPU, e.g. one written by
+# sentence_transformers.export_dynamic_quantized_onnx_model(model, "avx512_vnni", ...);
+# needs sentence-transformers[onnx]
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+
+
+def load_embedder():
+    model_kwargs = {"device": EMBEDDING_DEVICE}
+    if EMBEDDING_BACKEND == "onnx":
+        model_kwargs.update(backend="onnx", model_kwargs={"file_name": EMBEDDING_ONNX_FILE})
+    embedder = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME, model_kwargs=model_kwargs)
+    if EMBEDDING_BACKEND == "torch" and EMBEDDING_DEVICE.startswith("cuda"):
+        embedder.client.half()
+    return embedder
 
 
-def get_retriever():
-    embedder = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+# LangChain's wrapper is only needed to load the store; queries go to the SentenceTransformer directly
+embedder = load_embedder()
+model: SentenceTransformer = embedder.client
+
+
+def load_vectorstore():
     try:
-        vectorstore = FAISS.load_local(VECTORSTORE_PATH, embeddings=embedder, allow_dangerous_deserialization=True)
-        retriever = vectorstore.as_retriever()
-        return retriever
+        store = FAISS.load_local(VECTORSTORE_PATH, embeddings=embedder, allow_dangerous_deserialization=True)
     except (FileNotFoundError, RuntimeError) as e:
         print(f"Warning: Could not load FAISS index from {VECTORSTORE_PATH}: {e}")
         print("The /retrieve endpoint will not work until a FAISS index is created.")
         return None
-
-
-retriever = get_retriever()
+    if isinstance(store.index, faiss.IndexIVF):
+        store.index.nprobe = FAISS_NPROBE
+    return store
+
+
+vectorstore = load_vectorstore()
+
+# Embedding and FAISS search release the GIL, so a thread per core keeps requests overlapping
+SEARCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def search(queries: List[str], k: int) -> List[List[str]]:
+    """Embed all queries in one batch and look them all up with a single FAISS search."""
+    # Same newline folding as HuggingFaceEmbeddings; FAISS needs float32 even from an fp16 model
+    texts = [q.replace("\n", " ") for q in queries]
+    embeddings = model.encode(texts, batch_size=64, convert_to_numpy=True).astype(np.float32, copy=False)
+    # Match LangChain's own query path for stores built with normalize_L2
+    if vectorstore._normalize_L2:
+        faiss.normalize_L2(embeddings)
+    _, indices = vectorstore.index.search(embeddings, k)
+    docstore, docstore_ids = vectorstore.docstore, vectorstore.index_to_docstore_id
+    # FAISS pads rows with -1 when the index holds fewer than k vectors
+    return [
+        [docstore.search(docstore_ids[i]).page_content for i in row if i != -1]
+        for row in indices
+    ]
+
+
+# Retrieval is deterministic for a loaded index, so results are cached per (query digest, k)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+_result_cache: "OrderedDict[Tuple[bytes, int], List[str]]" = OrderedDict()
+# Queries currently being searched: key -> (batch future, row in that batch)
+_inflight: Dict[Tuple[bytes, int], Tuple[asyncio.Future, int]] = {}
+
+
+def _finish_batch(keys: List[Tuple[bytes, int]], batch: asyncio.Future):
+    for key in keys:
+        _inflight.pop(key, None)
+    if batch.cancelled() or batch.exception() is not None:
+        return
+    for key, results in zip(keys, batch.result()):
+        _result_cache[key] = results
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+async def cached_search(queries: List[str], k: int) -> List[List[str]]:
+    """search() with an LRU result cache; concurrent requests for the same query share one search"""
+    keys = [(hashlib.sha1(q.encode()).digest(), k) for q in queries]
+    results: Dict[Tuple[bytes, int], List[str]] = {}
+    pending: Dict[Tuple[bytes, int], Tuple[asyncio.Future, int]] = {}
+    missing: Dict[Tuple[bytes, int], str] = {}
+    for key, q in zip(keys, queries):
+        if key in results or key in pending or key in missing:
+            continue
+        if key in _result_cache:
+            _result_cache.move_to_end(key)
+            results[key] = _result_cache[key]
+        elif key in _inflight:
+            pending[key] = _inflight[key]
+        else:
+            missing[key] = q
+    
+    if missing:
+        # Everything not cached or already in flight goes into one batched search
+        batch = asyncio.get_running_loop().run_in_executor(SEARCH_EXECUTOR, search, list(missing.values()), k)
+        for i, key in enumerate(missing):
+            _inflight[key] = pending[key] = (batch, i)
+        batch.add_done_callback(lambda f, batch_keys=list(missing): _finish_batch(batch_keys, f))
+    
+    for key, (batch, i) in pending.items():
+        # Shielded so a disconnecting client doesn't cancel a search other requests are waiting on
+        results[key] = (await asyncio.shield(batch))[i]
+    return [results[key] for key in keys]
 # --------------------------------------------------------
 
 
 @app.post(
     "/retrieve",
-    response_model=RetrievalResponse,
     summary="Retrieve top-k docs for each query",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/RetrievalQueryInput"}}},
+        }
+    },
+    responses={
+        200: {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/RetrievalResponse"}}}},
+    },
 )
-def retrieve_docs(input: RetrievalQueryInput):
+async def retrieve_docs(request: Request):
     """
     Given a list of user queries, returns top-k retrieved documents per query.
     """
-    if retriever is None:
+    try:
+        data = msgspec.json.decode(await request.body(), type=RetrievalQueryInput)
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    if vectorstore is None:
         raise HTTPException(
             status_code=503, 
             detail=f"FAISS index not available. Please ensure the index exists at {VECTORSTORE_PATH}"
         )
     
+    if not data.queries:
+        return Response(msgspec.json.encode(RetrievalResponse(responses=[])), media_type="application/json")
+    
     try:
-        out = []
-        for q in input.queries:
-            docs = retriever.get_relevant_documents(q, k=input.k)
-            results = [doc.page_content for doc in docs]
-            out.append(RetrievedDoc(query=q, results=results))
-        return RetrievalResponse(responses=out)
+        results = await cached_search(data.queries, data.k)
+        response = RetrievalResponse(
+            responses=[RetrievedDoc(query=q, results=r) for q, r in zip(data.queries, results)]
+        )
+        return Response(msgspec.json.encode(response), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
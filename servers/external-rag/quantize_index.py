@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Quantize the RAG FAISS index
+
+Rewrites the flat FP32 index saved by LangChain (faiss_index/index.faiss) as a
+compressed index so searches stream far fewer bytes per query:
+
+- IVF-PQ (inverted lists + 8-bit product quantization) when there are enough
+  vectors to train it
+- 8-bit scalar quantization otherwise
+
+Vector ids are preserved, so the existing index.pkl docstore mapping still
+applies. The original index is kept alongside as index.faiss.flat.
+"""
+
+import argparse
+import math
+import os
+import shutil
+
+import faiss
+
+# FAISS wants roughly this many training points per centroid / PQ code
+MIN_POINTS_PER_CENTROID = 39
+
+
+def build_quantized_index(index: faiss.Index, nlist: int) -> faiss.Index:
+    """Train a quantized index on the vectors of a flat index and add them in order"""
+    d, n = index.d, index.ntotal
+    vectors = index.reconstruct_n(0, n)
+
+    # Cap the list count so every centroid gets enough training points
+    nlist = min(nlist, max(1, int(4 * math.sqrt(n))), max(1, n // MIN_POINTS_PER_CENTROID))
+    m = d // 4 if d % 4 == 0 else d
+
+    if n >= MIN_POINTS_PER_CENTROID * 256:
+        quantizer = faiss.IndexFlat(d, index.metric_type)
+        quantized = faiss.IndexIVFPQ(quantizer, d, nlist, m, 8, index.metric_type)
+    else:
+        quantized = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, index.metric_type)
+
+    quantized.train(vectors)
+    quantized.add(vectors)
+    return quantized
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize the RAG FAISS index in place")
+    parser.add_argument("--index-path", default="faiss_index", help="LangChain FAISS index directory")
+    parser.add_argument("--nlist", type=int, default=4096, help="Maximum number of IVF lists")
+    args = parser.parse_args()
+
+    index_file = os.path.join(args.index_path, "index.faiss")
+    index = faiss.read_index(index_file)
+    if not isinstance(index, faiss.IndexFlat):
+        print(f"{index_file} is already a {type(index).__name__}; nothing to do")
+        return
+
+    quantized = build_quantized_index(index, args.nlist)
+
+    shutil.copyfile(index_file, index_file + ".flat")
+    faiss.write_index(quantized, index_file)
+    print(f"Wrote {type(quantized).__name__} with {quantized.ntotal} vectors to {index_file}")
+
+
+if __name__ == "__main__":
+    main()